@@ -0,0 +1,170 @@
+"""
+Frame-phase throughput benchmarks.
+
+Times the real per-frame code paths at configurable entity counts on the
+dummy video driver and reports microseconds per frame and Python-level
+allocations (tracemalloc) for each phase. Results are written as JSON so
+runs from different commits can be compared.
+
+    python -m benchmarks.bench_frame --counts 10 100 1000 --output bench.json
+    python -m benchmarks.bench_frame --compare bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+import pygame
+
+from src.headless import HeadlessRunner, ScriptedKeys
+from src.settings import Settings
+
+
+def populate(game, count, rng):
+    """Top the enemy and bullet groups up to `count` live sprites each, scattered on screen."""
+    w, h = Settings.Screen.WIDTH, Settings.Screen.HEIGHT
+    while len(game.enemies) < count:
+        enemy = game.enemy_pool.acquire((game.enemies, game.all_sprites))
+        enemy.rect.center = (rng.randrange(w), rng.randrange(h))
+    while len(game.bullets) < count:
+        game.bullet_pool.acquire((game.bullets, game.all_sprites), rng.randrange(w), rng.randrange(h))
+
+
+def make_phases(game):
+    steer = [ScriptedKeys((pygame.K_LEFT,)), ScriptedKeys((pygame.K_RIGHT,))]
+    dt = Settings.Headless.FIXED_DT
+    frame = [0]
+    hud_frame = [0]
+
+    def player_update():
+        # Alternate steering so the bank angle keeps sweeping through the rotation cache
+        frame[0] += 1
+        game.player.update(steer[(frame[0] // 30) % 2], dt)
+
+    def hud_draw():
+        # In real play the FPS reading changes nearly every frame and forces a rebuild
+        hud_frame[0] += 1
+        game.hud.draw(game.screen, game.player, 55 + hud_frame[0] % 10)
+
+    return {
+        "player_update": player_update,
+        "handle_collisions": game.handle_collisions,
+        "enemies_update": game.enemies.update,
+        "bullets_update": game.bullets.update,
+        "all_sprites_draw": lambda: game.all_sprites.draw(game.screen),
+        "hud_draw": hud_draw,
+    }
+
+
+def bench_count(count, frames, alloc_frames, seed):
+    runner = HeadlessRunner(seed=seed)
+    game = runner.game
+    # Keep the player alive no matter how crowded the benchmark gets
+    game.player.take_damage = lambda amount: None
+    rng = random.Random(seed)
+    phases = make_phases(game)
+
+    timings = {name: 0.0 for name in phases}
+    for _ in range(frames):
+        for name, phase in phases.items():
+            # Phases like collisions and updates kill sprites; refill outside the timer
+            populate(game, count, rng)
+            start = time.perf_counter()
+            phase()
+            timings[name] += time.perf_counter() - start
+
+    allocs = {name: {"peak_bytes": 0, "net_bytes": 0} for name in phases}
+    tracemalloc.start()
+    for _ in range(alloc_frames):
+        for name, phase in phases.items():
+            populate(game, count, rng)
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            phase()
+            after, peak = tracemalloc.get_traced_memory()
+            allocs[name]["peak_bytes"] += peak - before
+            allocs[name]["net_bytes"] += after - before
+    tracemalloc.stop()
+    runner.close()
+
+    return {
+        name: {
+            "us_per_frame": timings[name] / frames * 1e6,
+            "alloc_peak_bytes_per_frame": allocs[name]["peak_bytes"] / max(alloc_frames, 1),
+            "alloc_net_bytes_per_frame": allocs[name]["net_bytes"] / max(alloc_frames, 1),
+        }
+        for name in phases
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results, baseline=None):
+    base = {}
+    if baseline:
+        base = {r["count"]: r["phases"] for r in baseline["results"]}
+
+    header = f"{'count':>7} {'phase':<18} {'us/frame':>10} {'peak B':>10}"
+    if base:
+        header += f" {'baseline':>10} {'ratio':>7}"
+    print(header)
+    for result in results:
+        for name, phase in result["phases"].items():
+            line = f"{result['count']:>7} {name:<18} {phase['us_per_frame']:>10.1f} {phase['alloc_peak_bytes_per_frame']:>10.0f}"
+            old = base.get(result["count"], {}).get(name)
+            if old:
+                ratio = phase["us_per_frame"] / old["us_per_frame"] if old["us_per_frame"] else float("inf")
+                line += f" {old['us_per_frame']:>10.1f} {ratio:>6.2f}x"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--alloc-frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="JSON from a previous run to compare against")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "frames": args.frames,
+            "alloc_frames": args.alloc_frames,
+            "seed": args.seed,
+        },
+        "results": [
+            {"count": count, "phases": bench_count(count, args.frames, args.alloc_frames, args.seed)}
+            for count in args.counts
+        ],
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(report["results"], baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
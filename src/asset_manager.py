@@ -1,16 +1,93 @@
+import hashlib
+import os
+import queue
+import struct
+import threading
+import time
+
 import pygame
 from src.settings import Settings
 
+
+# Header for cached pixel files: magic, width, height
+CACHE_HEADER = struct.Struct("<4sII")
+CACHE_MAGIC = b"RGBA"
+
+
+class AssetHandle:
+    """Reference to an image that may not be loaded yet; resolves on first get()."""
+
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+
+    @property
+    def ready(self):
+        return self.name in self.manager.images
+
+    def get(self):
+        return self.manager.get_image(self.name)
+
+
+class Preloader:
+    """
+    Daemon thread that decodes and scales images (and parses maps) ahead of use.
+
+    Only display-independent work happens here (file/cache read, decode,
+    scale, parsing). Results wait in `results` until AssetManager.pump()
+    picks them up on the main thread and converts images to the screen format.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = None
+
+    def close(self):
+        """Stop the worker thread; it restarts on the next submit()."""
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, key, func, args):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._work, name="asset-preloader", daemon=True)
+            self.thread.start()
+        self.requests.put((key, func, args))
+
+    def _work(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            key, func, args = request
+            try:
+                self.results.put((key, func(*args), None))
+            except Exception as e:
+                self.results.put((key, None, e))
+
+
 class AssetManager:
     def __init__(self):
         self.images = {}
+        self.declared = {}  # image name -> (path, scale_factor), loaded on first get_image()
+        self.prepared = {}  # (path, scale_factor) -> converted image preloaded but not claimed yet
+        self.wanted = set() # (path, scale_factor) submitted to the preloader and still unclaimed
+        self.jobs = {}      # load_async() key -> (value, error), or None while running
+        self.preloader = Preloader(self)
+        self.sheets = {}   # sheet name -> {region name: Rect in the scaled sheet}
+        self.atlases = {}  # atlas name -> packed surface
+        self.masks = {}    # image name -> (image, mask, opaque bounds), shared by every sprite using it
+
+        self.cache_dir = Settings.Assets.CACHE_DIR if Settings.Assets.DISK_CACHE_ENABLED else None
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def load_and_scale_image(self, name, path, scale_factor, fallback_size=(16,16)):
         try:
-            image = pygame.image.load(path).convert_alpha()
-            scaled_w = int(image.get_width() * scale_factor)
-            scaled_h = int(image.get_height() * scale_factor)
-            self.images[name] = pygame.transform.scale(image, (scaled_w, scaled_h))
+            self.images[name] = self._load_scaled(path, scale_factor)
         except Exception as e:
             print(f"Warning: failed to load {path}: {e}. Using placeholder for '{name}'.")
             scaled_w = int(fallback_size[0] * scale_factor)
@@ -20,5 +97,287 @@ class AssetManager:
             pygame.draw.rect(surf, Settings.Colors.WHITE, surf.get_rect(), 2)
             self.images[name] = surf
 
+    def load_many(self, entries):
+        """Bulk load [(name, path, scale_factor), ...]; cached entries skip decode and scale."""
+        for name, path, scale_factor in entries:
+            self.load_and_scale_image(name, path, scale_factor)
+
     def get_image(self, name):
-        return self.images.get(name)
\ No newline at end of file
+        image = self.images.get(name)
+        if image is None and name in self.declared:
+            path, scale_factor = self.declared[name]
+            self.load_and_scale_image(name, path, scale_factor)
+            image = self.images[name]
+        return image
+
+    # -------------------
+    # Manifests & preloading
+    # -------------------
+    def declare(self, name, path, scale_factor=None):
+        """Register an image without loading it; it loads on first get_image()."""
+        scale_factor = Settings.SCALE_FACTOR if scale_factor is None else scale_factor
+        self.declared[name] = (path, scale_factor)
+        return AssetHandle(self, name)
+
+    def handle(self, name):
+        return AssetHandle(self, name)
+
+    def _manifest_entries(self, manifest):
+        for name, path_key in manifest:
+            yield name, getattr(Settings.Paths, path_key), Settings.SCALE_FACTOR
+
+    def load_manifest(self, manifest):
+        """Load a Settings.Assets.MANIFESTS entry now."""
+        self.load_many(self._manifest_entries(manifest))
+
+    def preload(self, manifest):
+        """Declare a manifest's images and start decoding them in the background."""
+        for name, path, scale_factor in self._manifest_entries(manifest):
+            self.declare(name, path, scale_factor)
+            key = self._prepared_key(path, scale_factor)
+            if not Settings.Assets.PRELOAD_THREAD or name in self.images or key in self.wanted:
+                continue
+            self.wanted.add(key)
+            self.preloader.submit(key, self._decode, (path, scale_factor))
+
+    def load_async(self, key, func, *args):
+        """Run `func(*args)` on the preloader thread; collect it with job_result(key) once done."""
+        if not Settings.Assets.PRELOAD_THREAD:
+            try:
+                self.jobs[key] = (func(*args), None)
+            except Exception as e:
+                self.jobs[key] = (None, e)
+            return
+        self.jobs[key] = None
+        self.preloader.submit(key, func, args)
+
+    def job_result(self, key):
+        """Pop a finished load_async() result, re-raising whatever the job raised."""
+        value, error = self.jobs.pop(key)
+        if error is not None:
+            raise error
+        return value
+
+    @property
+    def loading(self):
+        """Number of preloads and async jobs not finished yet."""
+        running = sum(1 for result in self.jobs.values() if result is None)
+        return len(self.wanted) - len(self.prepared) + running
+
+    def pump(self, budget_ms):
+        """
+        Convert finished preloads to the display format (main thread only),
+        stopping once `budget_ms` is used up. Always converts at least one so
+        loading can't stall behind a slow frame.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        converted = 0
+        while True:
+            try:
+                key, image, error = self.preloader.results.get_nowait()
+            except queue.Empty:
+                break
+            if key in self.jobs:
+                self.jobs[key] = (image, error)
+            elif key in self.wanted:
+                if error is not None:
+                    self.wanted.discard(key)  # Failed: get_image() falls back to a sync load
+                else:
+                    self.prepared[key] = image.convert_alpha()
+                    converted += 1
+            if time.perf_counter() >= deadline:
+                break
+        return converted
+
+    def close(self):
+        """Stop background loading (call on shutdown so the thread and its surfaces go away)."""
+        self.preloader.close()
+
+    def _prepared_key(self, path, scale_factor):
+        return os.path.normcase(os.path.abspath(path)), scale_factor
+
+    # -------------------
+    # Masks
+    # -------------------
+    def get_mask(self, name):
+        """Collision mask for an image, built once and shared. Treat it as read-only."""
+        return self._mask_entry(name)[1]
+
+    def get_mask_bounds(self, name):
+        """Rect of the image's opaque pixels, relative to its top-left."""
+        return self._mask_entry(name)[2].copy()
+
+    def _mask_entry(self, name):
+        image = self.get_image(name)
+        if image is None:
+            raise KeyError(name)
+        entry = self.masks.get(name)
+        # Rebuild if the image was replaced (reload, atlas packing, ...)
+        if entry is None or entry[0] is not image:
+            mask = pygame.mask.from_surface(image)
+            rects = mask.get_bounding_rects()
+            bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+            entry = (image, mask, bounds)
+            self.masks[name] = entry
+        return entry
+
+    # -------------------
+    # Sprite sheets
+    # -------------------
+    def load_sprite_sheet(self, name, path, tile_size, scale_factor, spacing=0, margin=0, region_names=None):
+        """
+        Slice a uniform grid sheet into images named "<name>:<index>" (row-major).
+
+        `region_names` optionally maps friendly names to indices; those are
+        registered as images too. Regions are subsurfaces of one scaled sheet.
+        """
+        self.load_and_scale_image(name, path, scale_factor)
+        sheet = self.images[name]
+
+        tile = int(tile_size * scale_factor)
+        step = int((tile_size + spacing) * scale_factor)
+        offset = int(margin * scale_factor)
+        cols = max(1, (sheet.get_width() - offset + step - tile) // step)
+        rows = max(1, (sheet.get_height() - offset + step - tile) // step)
+
+        regions = {}
+        for row in range(rows):
+            for col in range(cols):
+                rect = pygame.Rect(offset + col * step, offset + row * step, tile, tile)
+                if not sheet.get_rect().contains(rect):
+                    continue
+                index = row * cols + col
+                regions[f"{name}:{index}"] = rect
+                self.images[f"{name}:{index}"] = sheet.subsurface(rect)
+
+        for region_name, index in (region_names or {}).items():
+            key = f"{name}:{index}"
+            if key in regions:
+                regions[region_name] = regions[key]
+                self.images[region_name] = self.images[key]
+
+        self.sheets[name] = regions
+        return regions
+
+    # -------------------
+    # Atlas
+    # -------------------
+    def build_atlas(self, atlas_name, names, max_width=1024, padding=1):
+        """
+        Pack the named images into one surface (simple shelf packing) and
+        replace each entry with a subsurface of it, so frequently drawn
+        sprites share one block of memory. Call before entities grab images.
+        """
+        images = [(n, self.images[n]) for n in names if n in self.images]
+        if not images:
+            return None
+        images.sort(key=lambda item: item[1].get_height(), reverse=True)
+
+        placements = []
+        x = y = shelf_h = width = 0
+        for name, image in images:
+            w, h = image.get_size()
+            if x and x + w > max_width:
+                y += shelf_h + padding
+                x = shelf_h = 0
+            placements.append((name, image, pygame.Rect(x, y, w, h)))
+            x += w + padding
+            shelf_h = max(shelf_h, h)
+            width = max(width, x)
+
+        atlas = pygame.Surface((width, y + shelf_h), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+        for name, image, rect in placements:
+            atlas.blit(image, rect)
+        for name, image, rect in placements:
+            self.images[name] = atlas.subsurface(rect)
+
+        self.atlases[atlas_name] = atlas
+        return atlas
+
+    # -------------------
+    # Disk cache
+    # -------------------
+    def _load_scaled(self, path, scale_factor):
+        key = self._prepared_key(path, scale_factor)
+        if key in self.wanted:
+            self.wanted.discard(key)
+            prepared = self.prepared.pop(key, None)
+            if prepared is not None:
+                return prepared
+        return self._decode(path, scale_factor).convert_alpha()
+
+    def _decode(self, path, scale_factor):
+        """Read + scale without touching the display, so it's safe off the main thread."""
+        cache_path = self._cache_path(path, scale_factor)
+        if cache_path is not None:
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+        self.cache_misses += 1
+        image = pygame.image.load(path)
+        scaled_w = int(image.get_width() * scale_factor)
+        scaled_h = int(image.get_height() * scale_factor)
+        image = pygame.transform.scale(image, (scaled_w, scaled_h))
+        if cache_path is not None:
+            self._write_cache(cache_path, image)
+        return image
+
+    def _cache_path(self, path, scale_factor):
+        if self.cache_dir is None:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        # "<source>_<version>.rgba": the source part lets a rewrite find and drop stale versions
+        source = hashlib.sha1(f"{os.path.abspath(path)}|{scale_factor}".encode("utf-8")).hexdigest()
+        version = hashlib.sha1(str(mtime).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{source}_{version}.rgba")
+
+    def _read_cache(self, cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+            magic, w, h = CACHE_HEADER.unpack_from(data)
+            if magic != CACHE_MAGIC or len(data) != CACHE_HEADER.size + w * h * 4:
+                return None
+            # Wraps the file contents in place; the convert_alpha() that follows is the only copy
+            return pygame.image.frombuffer(memoryview(data)[CACHE_HEADER.size:], (w, h), "RGBA")
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def _write_cache(self, cache_path, image):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"  # The preloader may write too
+            with open(tmp_path, "wb") as f:
+                f.write(CACHE_HEADER.pack(CACHE_MAGIC, *image.get_size()))
+                f.write(pygame.image.tobytes(image, "RGBA"))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: could not write asset cache {cache_path}: {e}")
+            return
+        self._prune_cache(cache_path)
+
+    def _prune_cache(self, cache_path):
+        """Delete cached versions of the same source older than `cache_path`."""
+        name = os.path.basename(cache_path)
+        source = name.split("_", 1)[0]
+        try:
+            entries = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.endswith(".rgba") or entry == name:
+                continue
+            # Older versions of this source, plus files from before versioned names
+            if entry.startswith(source + "_") or "_" not in entry:
+                try:
+                    os.remove(os.path.join(self.cache_dir, entry))
+                except OSError:
+                    pass
@@ -0,0 +1,59 @@
+import weakref
+
+import numpy as np
+import pygame
+
+
+class OutlineCache:
+    """
+    Collision outlines computed once per distinct image.
+
+    Sprites that share an image (every enemy, every bullet) share its outline,
+    and each rotated player image from the RotationCache gets its own entry.
+    Outlines are stored relative to the image's top-left as an int array, so
+    placing one on screen is a single vectorized add. Keys are weak: when the
+    rotation cache evicts an image, its outline goes with it.
+    """
+
+    def __init__(self):
+        self.outlines = weakref.WeakKeyDictionary()
+        self.builds = 0
+
+    def get(self, image, mask):
+        points = self.outlines.get(image)
+        if points is None:
+            points = np.array(mask.outline(), dtype=np.int32).reshape(-1, 2)
+            self.outlines[image] = points
+            self.builds += 1
+        return points
+
+    def placed(self, sprite):
+        """Outline of `sprite` in screen coordinates, as a list of (x, y)."""
+        points = self.get(sprite.image, sprite.mask)
+        if len(points) < 3:
+            return None
+        return (points + (sprite.rect.left, sprite.rect.top)).tolist()
+
+
+# Shared by every entity and the batched renderer
+outline_cache = OutlineCache()
+
+
+class DebugRenderer:
+    """Draws every hitbox in one pass over the sprite groups."""
+
+    def __init__(self, cache=None):
+        self.cache = cache or outline_cache
+
+    def draw(self, screen, sprites):
+        draw_lines = pygame.draw.lines
+        draw_rect = pygame.draw.rect
+        placed = self.cache.placed
+        for sprite in sprites:
+            color = sprite.DEBUG_COLOR
+            if getattr(sprite, "mask", None) is None:
+                draw_rect(screen, color, sprite.rect, 2)
+                continue
+            points = placed(sprite)
+            if points is not None:
+                draw_lines(screen, color, True, points, 2)
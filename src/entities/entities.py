@@ -1,19 +1,31 @@
 import pygame
 import random
 from src.settings import Settings
+from src.rotation_cache import RotationCache
+from src.entities.pool import Poolable
+from src.debug_draw import outline_cache
 
 
 # -------------------
 # Entities
 # -------------------
 class Player(pygame.sprite.Sprite):
+    DEBUG_COLOR = (0, 0, 250)
+
     def __init__(self, asset_manager):
         super().__init__()
         self.original_image = asset_manager.get_image("player")
-        self.image = self.original_image.copy()
+        self.rotation_cache = RotationCache(
+            self.original_image,
+            Settings.Player.MAX_BANK_ANGLE,
+            Settings.Player.ROTATION_CACHE_RESOLUTION,
+            Settings.Player.ROTATION_CACHE_SIZE
+        )
+        if Settings.Player.PREWARM_ROTATION_CACHE:
+            self.rotation_cache.prewarm()
+        self.image, self.mask = self.rotation_cache.get(0)
         self.pos = pygame.math.Vector2(Settings.Screen.WIDTH // 2, Settings.Screen.HEIGHT - 50)
         self.rect = self.image.get_rect(center=self.pos)
-        self.mask = pygame.mask.from_surface(self.image)
         self.health = Settings.Player.MAX_HEALTH
         self.score = 0
         self.current_velocity = pygame.math.Vector2(0, 0)
@@ -71,9 +83,9 @@ class Player(pygame.sprite.Sprite):
             Settings.Player.BANK_SPEED * delta_time
         )
     
-        self.image = pygame.transform.rotate(self.original_image, self.current_rotation)
+        # Lookup instead of rotate + from_surface every tick
+        self.image, self.mask = self.rotation_cache.get(self.current_rotation)
         self.rect = self.image.get_rect(center=self.pos)
-        self.mask = pygame.mask.from_surface(self.image)
 
         self.pos += self.current_velocity * delta_time
         self.rect.center = self.pos 
@@ -90,52 +102,60 @@ class Player(pygame.sprite.Sprite):
         self.score += points
 
     def draw_debug(self, screen):
-        DEBUG_COLOR = (0, 0, 250)
-        points = self.mask.outline()
-        offset_points = []
-        for point in points:
-            px = point[0] + self.rect.left
-            py = point[1] + self.rect.top
-            offset_points.append((px, py))
-        if len(offset_points) > 2:
-            pygame.draw.lines(screen, DEBUG_COLOR, True, offset_points, 2)
+        offset_points = outline_cache.placed(self)
+        if offset_points:
+            pygame.draw.lines(screen, self.DEBUG_COLOR, True, offset_points, 2)
 
 # -------------------
 # Enemy Class
 # -------------------
-class Enemy(pygame.sprite.Sprite):
+class Enemy(Poolable, pygame.sprite.Sprite):
+    DEBUG_COLOR = Settings.Colors.RED
+
     def __init__(self, asset_manager):
         super().__init__()
         self.image = asset_manager.get_image("enemy")
-        self.rect = self.image.get_rect(center=(random.randint(50, Settings.Screen.WIDTH - 50), -50))
-        self.mask = pygame.mask.from_surface(self.image)
+        self.rect = self.image.get_rect()
+        self.mask = asset_manager.get_mask("enemy")  # Shared by every enemy
+        self.reset()
+
+    def reset(self):
+        self.rect.center = (random.randint(50, Settings.Screen.WIDTH - 50), -50)
         self.speed = Settings.Enemy.SPEED
+        self.formation = None  # Set by a Formation, which then owns this enemy's movement
+        self.formation_slot = None
 
     def update(self):
-        self.rect.y += self.speed
+        if self.formation is None:
+            self.rect.y += self.speed
         if self.rect.top > Settings.Screen.HEIGHT:
             self.kill()
 
-    def draw_debug(self, screen):
-        DEBUG_COLOR = Settings.Colors.RED
-        points = self.mask.outline()
-        offset_points = []
-        for point in points:
-            px = point[0] + self.rect.left
-            py = point[1] + self.rect.top
-            offset_points.append((px, py))
+    def kill(self):
+        if self.formation is not None:
+            self.formation.drop(self.formation_slot)
+            self.formation = None
+        super().kill()
 
-        if len(offset_points) > 2:
-            pygame.draw.lines(screen, DEBUG_COLOR, True, offset_points, 2)
+    def draw_debug(self, screen):
+        offset_points = outline_cache.placed(self)
+        if offset_points:
+            pygame.draw.lines(screen, self.DEBUG_COLOR, True, offset_points, 2)
 
 # -------------------
 # Bullet Class
 # -------------------
-class Bullet(pygame.sprite.Sprite):
+class Bullet(Poolable, pygame.sprite.Sprite):
+    DEBUG_COLOR = (0, 255, 0)
+
     def __init__(self, x, y, asset_manager):
         super().__init__()
         self.image = asset_manager.get_image("bullet")
-        self.rect = self.image.get_rect(center=(x, y))
+        self.rect = self.image.get_rect()
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.rect.center = (x, y)
         self.speed = Settings.Bullet.SPEED
 
     def update(self):
@@ -144,5 +164,4 @@ class Bullet(pygame.sprite.Sprite):
             self.kill()
 
     def draw_debug(self, screen):
-        DEBUG_COLOR = (0, 255, 0)
-        pygame.draw.rect(screen, DEBUG_COLOR, self.rect, 2)
+        pygame.draw.rect(screen, self.DEBUG_COLOR, self.rect, 2)
@@ -0,0 +1,80 @@
+class SpritePool:
+    """
+    Recycles dead sprites instead of constructing new ones.
+
+    Pooled sprites must mix in `Poolable` and implement `reset(*args)`, which puts
+    them back into a fresh state (position, speed, ...) without rebuilding their
+    image or mask. When a pooled sprite is killed, it returns itself here.
+    """
+
+    def __init__(self, factory, max_size=256):
+        self.factory = factory     # Builds a brand new sprite when the pool is empty
+        self.max_size = max_size   # Max idle sprites kept around
+        self.free = []
+
+        # Stats
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self, groups, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.in_pool = False
+            self.reused += 1
+        else:
+            sprite = self.factory()
+            sprite.pool = self
+            self.created += 1
+        sprite.reset(*args)
+        sprite.add(*groups)
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return sprite
+
+    def release(self, sprite):
+        if sprite.in_pool:
+            return  # Already returned (e.g. killed twice)
+        self.in_use -= 1
+        if len(self.free) < self.max_size:
+            sprite.in_pool = True
+            self.free.append(sprite)
+        else:
+            sprite.pool = None
+            self.discarded += 1
+
+    def prefill(self, count):
+        while len(self.free) < min(count, self.max_size):
+            sprite = self.factory()
+            sprite.pool = self
+            sprite.in_pool = True
+            self.free.append(sprite)
+            self.created += 1
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "discarded": self.discarded,
+            "in_use": self.in_use,
+            "free": len(self.free),
+            "high_water": self.high_water,
+        }
+
+
+class Poolable:
+    """Mixin for sprites managed by a SpritePool. List it before pygame.sprite.Sprite."""
+    pool = None
+    in_pool = False
+
+    def reset(self, *args):
+        raise NotImplementedError
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
@@ -0,0 +1,141 @@
+import numpy as np
+import pygame
+from src.settings import Settings
+
+
+# -------------------
+# Projectile Engine
+# -------------------
+class ProjectileEngine:
+    """
+    Struct-of-arrays projectile storage for bullet-hell densities.
+
+    Instead of one Sprite (and one Python update() call) per bullet, every live
+    projectile is a row in preallocated NumPy arrays. Rows [0, count) are alive;
+    culling compacts survivors to the front, so movement, culling and collision
+    are each a handful of vectorized operations regardless of bullet count.
+
+    Velocities are in pixels per frame, the same unit Bullet.speed uses.
+    """
+
+    def __init__(self, image, capacity=None):
+        self.image = image
+        self.capacity = capacity or Settings.Projectiles.CAPACITY
+        self.count = 0
+
+        self.pos = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.damage = np.zeros(self.capacity, dtype=np.int32)
+        self.alive = np.zeros(self.capacity, dtype=bool)
+
+        self.half_size = np.array(image.get_size(), dtype=np.float32) / 2.0
+        self.bounds = np.array([Settings.Screen.WIDTH, Settings.Screen.HEIGHT], dtype=np.float32)
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vx=0.0, vy=None, damage=1):
+        if self.count >= self.capacity:
+            return False  # Full; drop the shot rather than reallocating
+        if vy is None:
+            vy = -Settings.Bullet.SPEED
+        i = self.count
+        self.pos[i] = (x, y)
+        self.vel[i] = (vx, vy)
+        self.damage[i] = damage
+        self.alive[i] = True
+        self.count += 1
+        return True
+
+    def spawn_many(self, positions, velocities, damage=1):
+        """Spawn a batch from (N, 2) arrays; returns how many fit."""
+        n = min(len(positions), self.capacity - self.count)
+        if n <= 0:
+            return 0
+        start, end = self.count, self.count + n
+        self.pos[start:end] = positions[:n]
+        self.vel[start:end] = velocities[:n]
+        self.damage[start:end] = damage
+        self.alive[start:end] = True
+        self.count = end
+        return n
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        pos += self.vel[:n]
+
+        # Cull anything fully off screen, then compact survivors to the front
+        lo = pos + self.half_size
+        hi = pos - self.half_size
+        on_screen = (lo >= 0).all(axis=1) & (hi <= self.bounds).all(axis=1)
+        self._compact(self.alive[:n] & on_screen)
+
+    def _compact(self, keep):
+        n = self.count
+        survivors = int(np.count_nonzero(keep))
+        if survivors == n:
+            return
+        self.pos[:survivors] = self.pos[:n][keep]
+        self.vel[:survivors] = self.vel[:n][keep]
+        self.damage[:survivors] = self.damage[:n][keep]
+        self.alive[:survivors] = True
+        self.alive[survivors:n] = False
+        self.count = survivors
+
+    def collide(self, sprites, chunk=4096):
+        """
+        Batch AABB test of every projectile against every sprite rect.
+
+        Every projectile overlapping a sprite is consumed. Returns {sprite: damage}
+        for the sprites that were hit; the caller decides what a hit means.
+        """
+        n = self.count
+        sprites = list(sprites)
+        if n == 0 or not sprites:
+            return {}
+
+        rects = np.array([tuple(s.rect) for s in sprites], dtype=np.float32)
+        left, top = rects[:, 0], rects[:, 1]
+        right, bottom = left + rects[:, 2], top + rects[:, 3]
+
+        damage_taken = np.zeros(len(sprites), dtype=np.int64)
+        consumed = np.zeros(n, dtype=bool)
+        for start in range(0, n, chunk):
+            end = min(start + chunk, n)
+            p = self.pos[start:end]
+            p_left = (p[:, 0] - self.half_size[0])[:, None]
+            p_right = (p[:, 0] + self.half_size[0])[:, None]
+            p_top = (p[:, 1] - self.half_size[1])[:, None]
+            p_bottom = (p[:, 1] + self.half_size[1])[:, None]
+
+            # (projectiles x sprites) overlap matrix, same edge rules as Rect.colliderect
+            overlap = (p_left < right) & (p_right > left) & (p_top < bottom) & (p_bottom > top)
+            consumed[start:end] = overlap.any(axis=1)
+            damage_taken += self.damage[start:end] @ overlap
+
+        if consumed.any():
+            self.alive[:n] &= ~consumed
+            self._compact(self.alive[:n])
+
+        return {sprites[i]: int(damage_taken[i]) for i in np.flatnonzero(damage_taken)}
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def draw(self, surface):
+        """Blit every live projectile; returns the bounding rect drawn (or None)."""
+        n = self.count
+        if n == 0:
+            return None
+        image = self.image
+        topleft = (self.pos[:n] - self.half_size).astype(np.int32)
+        surface.fblits([(image, p) for p in topleft.tolist()])
+
+        x0, y0 = topleft.min(axis=0)
+        x1, y1 = topleft.max(axis=0)
+        w, h = image.get_size()
+        return pygame.Rect(int(x0), int(y0), int(x1 - x0) + w, int(y1 - y0) + h)
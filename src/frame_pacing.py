@@ -0,0 +1,129 @@
+from collections import deque
+
+from src.settings import Settings
+
+
+class FramePacer:
+    """
+    Frame limiter plus load-driven quality scaling.
+
+    tick() caps the frame rate and feeds the measured frame time into a
+    fixed-step accumulator: the simulation always advances in steps of
+    Headless.FIXED_DT (enemies, bullets and projectiles move a fixed amount
+    per step, so only a fixed step keeps game speed tied to wall time), the
+    remainder carries over to the next frame, and past
+    Performance.MAX_STEPS_PER_FRAME the backlog is dropped so a hitch can't
+    snowball into ever longer frames.
+
+    It also keeps a history of how long each frame's work took (excluding the
+    limiter's sleep). Every EVAL_INTERVAL frames the 90th percentile is compared
+    to the frame budget: over it, optional work is shed one quality level at a
+    time; well under it for RECOVER_EVALS checks in a row, one level comes back.
+    The gap between the two thresholds plus the slower recovery keeps it from
+    flapping between levels.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.clock = game.clock
+        self.history = deque(maxlen=Settings.Performance.HISTORY)
+        self.frames = 0
+        self.calm_evals = 0
+        self.accumulator = 0.0   # Wall time (s) not simulated yet
+        self.dropped_time = 0.0  # Seconds of wall time never simulated (past MAX_STEPS_PER_FRAME)
+
+        # Current quality, read by the systems that honour it
+        self.level = 0
+        self.show_debug_overlay = True
+        self.particle_scale = 1.0
+        self.apply_level(0)
+
+    @property
+    def budget_ms(self):
+        budget = Settings.Performance.FRAME_BUDGET_MS
+        return budget if budget is not None else 1000.0 / Settings.Render.TARGET_FPS
+
+    @property
+    def max_level(self):
+        return len(Settings.Performance.HUD_REFRESH_FRAMES) - 1
+
+    def tick(self, target_fps):
+        """Wait out the frame; return the list of dts to simulate this frame (may be empty)."""
+        delta_time = self.clock.tick(target_fps) / 1000.0
+        # Time spent working last frame, i.e. without the limiter's delay
+        self.record(self.clock.get_rawtime())
+        return self.steps(delta_time)
+
+    def steps(self, delta_time):
+        step = Settings.Headless.FIXED_DT
+        max_steps = Settings.Performance.MAX_STEPS_PER_FRAME
+        self.accumulator += delta_time
+        count = int(self.accumulator // step)
+        if count > max_steps:
+            self.dropped_time += (count - max_steps) * step
+            self.accumulator -= (count - max_steps) * step
+            count = max_steps
+        self.accumulator -= count * step
+        return [step] * count
+
+    # -------------------
+    # Quality scaling
+    # -------------------
+    def record(self, work_ms):
+        self.history.append(work_ms)
+        self.frames += 1
+        if Settings.Performance.ADAPTIVE_QUALITY and self.frames % Settings.Performance.EVAL_INTERVAL == 0:
+            self.evaluate()
+
+    def load_ms(self):
+        """90th percentile work time over the history window."""
+        if not self.history:
+            return 0.0
+        ordered = sorted(self.history)
+        return ordered[int(0.9 * (len(ordered) - 1))]
+
+    def evaluate(self):
+        perf = Settings.Performance
+        load = self.load_ms()
+        if load > self.budget_ms * perf.DEGRADE_RATIO:
+            self.calm_evals = 0
+            if self.level < self.max_level:
+                self.set_level(self.level + 1)
+        elif load < self.budget_ms * perf.RECOVER_RATIO:
+            self.calm_evals += 1
+            if self.calm_evals >= perf.RECOVER_EVALS and self.level > 0:
+                self.calm_evals = 0
+                self.set_level(self.level - 1)
+        else:
+            self.calm_evals = 0
+
+    def set_level(self, level):
+        level = max(0, min(self.max_level, level))
+        if level == self.level:
+            return
+        self.level = level
+        self.apply_level(level)
+        # Judge the new level on its own frames, not the ones that triggered the change
+        self.history.clear()
+
+    def apply_level(self, level):
+        perf = Settings.Performance
+        game = self.game
+        self.show_debug_overlay = perf.DEBUG_OVERLAY[level]
+        self.particle_scale = perf.PARTICLE_SCALE[level]  # No particle systems yet; for them to read
+        game.hud.refresh_frames = perf.HUD_REFRESH_FRAMES[level]
+
+        # A different resolution changes the player's rect/mask, which a recording
+        # wouldn't reproduce on playback, so leave it alone while recording
+        if game.recorder is None:
+            resolution = perf.ROTATION_CACHE_RESOLUTION[level] or Settings.Player.ROTATION_CACHE_RESOLUTION
+            game.player.rotation_cache.set_resolution(resolution)
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "load_ms": self.load_ms(),
+            "budget_ms": self.budget_ms,
+            "dropped_time": self.dropped_time,
+            "accumulator": self.accumulator,
+        }
@@ -1,3 +1,5 @@
+import os
+import random
 import pygame
 import sys
 from src.settings import Settings
@@ -5,10 +7,35 @@ from src.asset_manager import AssetManager
 from src.entities.entities import Player, Bullet, Enemy
 from src.states.states import PlayingState, PausedState, GameOverState
 from src.hud import HUD
+from src.spatial_hash import SpatialHash
+from src.entities.pool import SpritePool
+from src.entities.projectiles import ProjectileEngine
+from src.profiler import FrameProfiler, NullProfiler
+from src.world.map_loader import load_map
+from src.gameplay.formations import FormationManager
+from src.scheduler import Scheduler
+from src.replay import ReplayRecorder
+from src.debug_draw import DebugRenderer
+from src.frame_pacing import FramePacer
+from src.world.scrolling_manager import ScrollingManager
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, input_source=None):
+        self.headless = headless
+        if headless:
+            # No window: SDL's dummy driver still gives us surfaces for convert_alpha & co.
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+        # Enemy placement uses the global `random` module, so seeding it here
+        # makes a whole run reproducible. Unseeded runs pick a seed so they can
+        # still be recorded and replayed.
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        random.seed(seed)
+
         pygame.init()
         pygame.display.set_caption("Planes")
         self.screen = pygame.display.set_mode((Settings.Screen.WIDTH, Settings.Screen.HEIGHT))
@@ -18,26 +45,69 @@ class Game:
         
         # State
         self.running = True
+        self.input_source = input_source or pygame.key.get_pressed
+        # Not read from input_source: scripted sources count frames from the first update
         self.keys = pygame.key.get_pressed()
+        self.scheduler = Scheduler()  # Gameplay timers on simulated (unpaused) time
+        self.recorder = ReplayRecorder(self.seed) if Settings.Replay.RECORD else None
 
         # Assets
         self.asset_manager = AssetManager()
-        self.asset_manager.load_and_scale_image("player", Settings.Paths.PLAYER_IMAGE, Settings.SCALE_FACTOR)
-        self.asset_manager.load_and_scale_image("bullet", Settings.Paths.BULLET_IMAGE, Settings.SCALE_FACTOR)
-        self.asset_manager.load_and_scale_image("enemy", Settings.Paths.ENEMY_IMAGE, Settings.SCALE_FACTOR)
+        # Only what the first frame needs is loaded up front; the level streams in behind it
+        self.asset_manager.load_manifest(Settings.Assets.MANIFESTS["boot"])
+        self.asset_manager.build_atlas("sprites", Settings.Assets.ATLAS_SPRITES)
+        self.asset_manager.preload(Settings.Assets.MANIFESTS.get(Settings.Assets.LEVEL, ()))
+
+        # Static backdrop; also what the dirty-rect renderer erases with
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(Settings.Colors.BG)
+
+        # Scrolling map background. The map is indexed on the preloader thread and
+        # pump_assets() starts scrolling once it and the level's tiles are in.
+        self.scrolling = None
+        self.level_pending = Settings.World.ENABLED
+        if self.level_pending:
+            self.asset_manager.load_async("level_map", load_map, Settings.Paths.LEVEL_MAP)
 
         # Game systems
         self.hud = HUD(self.font)
+        self.debug_renderer = DebugRenderer()
+        if Settings.IS_DEBUG_MODE or Settings.Profiler.ENABLED:
+            self.profiler = FrameProfiler()
+        else:
+            self.profiler = NullProfiler()
 
         # Entities & groups
         self.player = Player(self.asset_manager)
-        self.all_sprites = pygame.sprite.Group(self.player)
+        if Settings.Render.USE_DIRTY_RECTS:
+            # RenderUpdates.draw reports the rects it touched (old + new positions)
+            self.all_sprites = pygame.sprite.RenderUpdates(self.player)
+        else:
+            self.all_sprites = pygame.sprite.Group(self.player)
         self.bullets = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
+        self.sprite_groups = {"all": self.all_sprites, "bullets": self.bullets, "enemies": self.enemies}
+        self.enemy_grid = SpatialHash(Settings.Collision.CELL_SIZE)
+
+        # Pools (dead bullets/enemies are recycled instead of re-created)
+        self.bullet_pool = SpritePool(lambda: Bullet(0, 0, self.asset_manager), Settings.Pools.BULLET_MAX)
+        self.enemy_pool = SpritePool(lambda: Enemy(self.asset_manager), Settings.Pools.ENEMY_MAX)
+        self.bullet_pool.prefill(Settings.Pools.BULLET_PREFILL)
+        self.enemy_pool.prefill(Settings.Pools.ENEMY_PREFILL)
+
+        # Optional array-backed projectiles (replaces Bullet sprites when enabled)
+        self.projectiles = None
+        if Settings.Projectiles.ENGINE_ENABLED:
+            self.projectiles = ProjectileEngine(self.asset_manager.get_image("bullet"))
+
+        # Formations
+        self.formations = FormationManager()
 
         # Timers
-        self.last_shot_time = 0
-        self.last_enemy_spawn_time = 0
+        self.can_shoot = True
+        self.scheduler.schedule_repeating(Settings.Timers.ENEMY_SPAWN_DELAY, self.spawn_enemy)
+        if Settings.Formations.ENABLED:
+            self.scheduler.schedule_repeating(Settings.Timers.FORMATION_SPAWN_DELAY, self.spawn_formation)
         
         # State
         self.states = {
@@ -48,58 +118,136 @@ class Game:
         self.current_state_key = "PLAYING"
         self.current_state = self.states[self.current_state_key]
 
+        self.pacer = FramePacer(self)
+
+    @property
+    def sim_time(self):
+        return self.scheduler.time
+
     def spawn_enemy(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_enemy_spawn_time > Settings.Timers.ENEMY_SPAWN_DELAY:
-            enemy = Enemy(self.asset_manager)
-            self.enemies.add(enemy)
-            self.all_sprites.add(enemy)
-            self.last_enemy_spawn_time = current_time
+        self.enemy_pool.acquire((self.enemies, self.all_sprites))
+
+    def spawn_formation(self):
+        members = [
+            self.enemy_pool.acquire((self.enemies, self.all_sprites))
+            for _ in range(Settings.Formations.SIZE)
+        ]
+        self.formations.spawn(members)
 
     def handle_collisions(self):
-        bullet_enemy = pygame.sprite.groupcollide(self.bullets, self.enemies, True, True)
+        # Broad phase: bucket enemies once, then only test nearby pairs
+        self.enemy_grid.rebuild(self.enemies)
+
+        bullet_enemy = self.enemy_grid.groupcollide(self.bullets, self.enemies, True, True)
         if bullet_enemy:
             hits = sum(len(v) for v in bullet_enemy.values())
             self.player.add_score(hits)
 
-        player_hit = pygame.sprite.spritecollide(self.player, self.enemies, True) 
+        if self.projectiles is not None:
+            projectile_hits = self.projectiles.collide(self.enemies)
+            for enemy in projectile_hits:
+                enemy.kill()
+            if projectile_hits:
+                self.player.add_score(len(projectile_hits))
+
+        player_hit = self.enemy_grid.spritecollide(self.player, self.enemies, True)
         if player_hit:
             damage = len(player_hit) * Settings.Player.COLLISION_DAMAGE
             self.player.take_damage(damage)
     
     def handle_shooting(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_shot_time > Settings.Timers.SHOOT_DELAY:
-            bullet = Bullet(self.player.rect.centerx, self.player.rect.top, self.asset_manager)
-            self.bullets.add(bullet)
-            self.all_sprites.add(bullet)
-            self.last_shot_time = current_time
+        if not self.can_shoot:
+            return
+        if self.projectiles is not None:
+            self.projectiles.spawn(self.player.rect.centerx, self.player.rect.top)
+        else:
+            self.bullet_pool.acquire(
+                (self.bullets, self.all_sprites),
+                self.player.rect.centerx, self.player.rect.top
+            )
+        self.can_shoot = False
+        self.scheduler.schedule(Settings.Timers.SHOOT_DELAY, self.reload)
+
+    def reload(self):
+        self.can_shoot = True
+
+    def pump_assets(self, budget_ms=None):
+        """Finish background asset loads within the frame budget; start the level when ready."""
+        if budget_ms is None:
+            budget_ms = Settings.Assets.PUMP_BUDGET_MS
+        self.asset_manager.pump(budget_ms)
+        if self.level_pending and not self.asset_manager.loading:
+            self.level_pending = False
+            try:
+                level_map = self.asset_manager.job_result("level_map")
+                self.scrolling = ScrollingManager(level_map, self.asset_manager)
+            except Exception as e:
+                print(f"Warning: failed to load map {Settings.Paths.LEVEL_MAP}: {e}. Using plain background.")
+
+    def close(self):
+        if Settings.Profiler.TRACE_PATH:
+            self.profiler.export(Settings.Profiler.TRACE_PATH)
+        self.asset_manager.close()
+
+    def step(self, events, delta_time):
+        """Run one frame of input + logic for the current state (no drawing)."""
+        next_state_key_from_events = self.current_state.handle_events(events)
+        self.profiler.mark("events")
+        next_state_key_from_update = self.current_state.update(delta_time)
+        return next_state_key_from_events, next_state_key_from_update
+
+    def apply_transition(self, next_state_key_from_events, next_state_key_from_update):
+        if next_state_key_from_events == "QUIT":
+            self.running = False
+
+        elif next_state_key_from_events != "SELF" and next_state_key_from_events is not None:
+            self.current_state_key = next_state_key_from_events
+            self.current_state = self.states[self.current_state_key]
+            self.current_state.enter()
+
+        elif next_state_key_from_update != "SELF" and next_state_key_from_update is not None:
+            self.current_state_key = next_state_key_from_update
+
+            if self.current_state_key == "GAME_OVER":
+                # Re-instantiate GAME_OVER state to reset its score text
+                self.states["GAME_OVER"] = GameOverState(self)
+
+            self.current_state = self.states[self.current_state_key]
+            self.current_state.enter()
 
     def run(self):
-        while self.running:
-            delta_time = self.clock.tick(60) / 1000.0
-            events = pygame.event.get()
-            next_state_key_from_events = self.current_state.handle_events(events)
-            next_state_key_from_update = self.current_state.update(delta_time)
-            self.current_state.draw(self.screen)
-            pygame.display.flip()
+        try:
+            while self.running:
+                target_fps = self.current_state.target_fps or Settings.Render.TARGET_FPS
+                steps = self.pacer.tick(target_fps)
+                self.profiler.begin_frame()
+                self.pump_assets()
+                events = pygame.event.get()
+                if steps:
+                    transition = self.step(events, steps[0])
+                else:
+                    # Frame shorter than one step: input still gets handled, nothing is simulated
+                    transition = (self.current_state.handle_events(events), None)
+                for delta_time in steps[1:]:
+                    if any(key not in (None, "SELF") for key in transition):
+                        break  # Apply the transition before simulating any further
+                    transition = self.step([], delta_time)
+                dirty_rects = self.current_state.draw(self.screen)
+                self.profiler.mark("draw")
+                if dirty_rects is None:
+                    pygame.display.flip()
+                elif dirty_rects:
+                    pygame.display.update(dirty_rects)
+                self.profiler.mark("flip")
+                self.profiler.end_frame(self.sprite_groups)
             
-            # State transition logic
-            if next_state_key_from_events == "QUIT":
-                self.running = False
-            
-            elif next_state_key_from_events != "SELF" and next_state_key_from_events is not None:
-                self.current_state_key = next_state_key_from_events
-                self.current_state = self.states[self.current_state_key]
-                
-            elif next_state_key_from_update != "SELF" and next_state_key_from_update is not None:
-                 self.current_state_key = next_state_key_from_update
-                 
-                 if self.current_state_key == "GAME_OVER":
-                     # Re-instantiate GAME_OVER state to reset its score text
-                     self.states["GAME_OVER"] = GameOverState(self) 
-                     
-                 self.current_state = self.states[self.current_state_key]
-
+                # State transition logic
+                self.apply_transition(*transition)
+        finally:
+            # Also on a crash: that's exactly the session a replay is wanted for
+            if self.recorder is not None:
+                self.recorder.finish(self)
+                self.recorder.save(Settings.Replay.PATH)
+            self.close()
         pygame.quit()
         sys.exit()
\ No newline at end of file
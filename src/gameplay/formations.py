@@ -0,0 +1,247 @@
+"""
+Enemy formations that fly along parametric paths.
+
+A path maps a parameter t in [0, 1] to screen positions and is evaluated for a
+whole array of t at once. When a wave spawns, its path is sampled once into a
+lookup table; after that, positioning every ship in the formation for a frame
+is a single vectorized table interpolation, however many ships there are.
+"""
+import math
+import random
+
+import numpy as np
+from src.settings import Settings
+
+
+# -------------------
+# Paths
+# -------------------
+class Path:
+    def evaluate(self, t):
+        """t: (N,) float array in [0, 1] -> (N, 2) positions."""
+        raise NotImplementedError
+
+    def table(self, samples):
+        return self.evaluate(np.linspace(0.0, 1.0, samples)).astype(np.float32)
+
+
+class LinePath(Path):
+    def __init__(self, start, end):
+        self.start = np.asarray(start, dtype=np.float64)
+        self.end = np.asarray(end, dtype=np.float64)
+
+    def evaluate(self, t):
+        return self.start + (self.end - self.start) * t[:, None]
+
+
+class SinePath(Path):
+    """A line with a sideways sine wobble of `amplitude` pixels, `cycles` times over the path."""
+
+    def __init__(self, start, end, amplitude, cycles=1.0, phase=0.0):
+        self.line = LinePath(start, end)
+        direction = self.line.end - self.line.start
+        length = np.hypot(*direction) or 1.0
+        self.normal = np.array([-direction[1], direction[0]]) / length
+        self.amplitude = amplitude
+        self.cycles = cycles
+        self.phase = phase
+
+    def evaluate(self, t):
+        wobble = self.amplitude * np.sin(2.0 * math.pi * self.cycles * t + self.phase)
+        return self.line.evaluate(t) + wobble[:, None] * self.normal
+
+
+class BezierPath(Path):
+    """Bezier curve of any order (Bernstein form)."""
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=np.float64)
+        n = len(self.points) - 1
+        self.coefficients = np.array([math.comb(n, i) for i in range(n + 1)], dtype=np.float64)
+
+    def evaluate(self, t):
+        n = len(self.points) - 1
+        i = np.arange(n + 1)
+        t = t[:, None]
+        basis = self.coefficients * (t ** i) * ((1.0 - t) ** (n - i))
+        return basis @ self.points
+
+
+class CirclePath(Path):
+    def __init__(self, center, radius, start_angle=0.0, turns=1.0):
+        self.center = np.asarray(center, dtype=np.float64)
+        self.radius = radius
+        self.start_angle = start_angle
+        self.turns = turns
+
+    def evaluate(self, t):
+        angle = self.start_angle + 2.0 * math.pi * self.turns * t
+        return self.center + self.radius * np.stack([np.cos(angle), np.sin(angle)], axis=1)
+
+
+class ChainPath(Path):
+    """Several paths flown back to back, each getting an equal share of t."""
+
+    def __init__(self, paths):
+        self.paths = paths
+
+    def evaluate(self, t):
+        count = len(self.paths)
+        scaled = np.clip(t, 0.0, 1.0) * count
+        segment = np.minimum(scaled.astype(np.int64), count - 1)
+        local = scaled - segment
+        out = np.empty((len(t), 2))
+        for i, path in enumerate(self.paths):
+            mask = segment == i
+            if mask.any():
+                out[mask] = path.evaluate(local[mask])
+        return out
+
+
+# -------------------
+# Formation
+# -------------------
+class Formation:
+    """
+    A group of enemy sprites following one path.
+
+    Ship i trails the leader by `delays[i]` seconds and is displaced by
+    `offsets[i]` pixels, so one path can give a snake (delays) or a rigid shape
+    such as a V (offsets), or both.
+    """
+
+    def __init__(self, path, members, duration, delays=None, offsets=None, samples=None):
+        self.members = list(members)
+        count = len(self.members)
+        self.duration = duration
+        self.elapsed = 0.0
+
+        self.table = path.table(samples or Settings.Formations.TABLE_SAMPLES)
+        self.delays = np.zeros(count) if delays is None else np.asarray(delays, dtype=np.float64)
+        self.offsets = np.zeros((count, 2)) if offsets is None else np.asarray(offsets, dtype=np.float32)
+
+        # Which slots still hold a live member; cleared by drop() when one is killed
+        self.alive = np.ones(count, dtype=bool)
+        self.alive_count = count
+        self.rects = [sprite.rect for sprite in self.members]
+        for slot, sprite in enumerate(self.members):
+            sprite.formation = self
+            sprite.formation_slot = slot
+        self.update(0.0)
+
+    @property
+    def finished(self):
+        return self.alive_count == 0
+
+    def drop(self, slot):
+        """Called by a member as it is killed (shot down, off screen, path done)."""
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self.alive_count -= 1
+
+    def positions(self):
+        """Interpolated (N, 2) positions for every member at the current time."""
+        t = np.clip((self.elapsed - self.delays) / self.duration, 0.0, 1.0)
+        f = t * (len(self.table) - 1)
+        i = np.minimum(f.astype(np.int64), len(self.table) - 2)
+        frac = (f - i)[:, None].astype(np.float32)
+        return self.table[i] + (self.table[i + 1] - self.table[i]) * frac + self.offsets, t
+
+    def update(self, delta_time):
+        self.elapsed += delta_time
+        positions, t = self.positions()
+
+        for slot in np.flatnonzero(self.alive & (t >= 1.0)).tolist():
+            self.members[slot].kill()
+
+        # Pygame rects can't be written in bulk, so placing ships is still one
+        # assignment per live member; everything else is array work
+        active = np.flatnonzero(self.alive)
+        if active.size:
+            rects = self.rects
+            for slot, center in zip(active.tolist(), positions[active].tolist()):
+                rects[slot].center = center
+
+
+# -------------------
+# Wave templates
+# -------------------
+def _column_delays(count, spacing):
+    return np.arange(count) * spacing
+
+
+def line_wave(members, rng):
+    w, h = Settings.Screen.WIDTH, Settings.Screen.HEIGHT
+    x = rng.uniform(0.2, 0.8) * w
+    path = LinePath((x, -60), (x + rng.uniform(-200, 200), h + 60))
+    return Formation(path, members, Settings.Formations.DURATION, _column_delays(len(members), 0.35))
+
+
+def sine_wave(members, rng):
+    w, h = Settings.Screen.WIDTH, Settings.Screen.HEIGHT
+    x = rng.uniform(0.3, 0.7) * w
+    path = SinePath((x, -60), (x, h + 60), amplitude=rng.uniform(80, 200), cycles=rng.uniform(1.0, 2.5))
+    return Formation(path, members, Settings.Formations.DURATION, _column_delays(len(members), 0.3))
+
+
+def bezier_wave(members, rng):
+    w, h = Settings.Screen.WIDTH, Settings.Screen.HEIGHT
+    side = rng.choice((-1, 1))
+    start_x = w / 2 - side * (w / 2 + 60)
+    path = BezierPath([(start_x, 60), (w / 2, h * 0.9), (w / 2 + side * w * 0.4, 0), (w / 2 + side * 100, h + 60)])
+    return Formation(path, members, Settings.Formations.DURATION, _column_delays(len(members), 0.25))
+
+
+def loop_wave(members, rng):
+    w, h = Settings.Screen.WIDTH, Settings.Screen.HEIGHT
+    radius = rng.uniform(80, 140)
+    side = rng.choice((-1, 1))
+    x = w / 2 - side * radius
+    y = h * 0.4
+    # Dive in, loop the loop, dive out
+    path = ChainPath([
+        LinePath((x, -60), (x, y)),
+        CirclePath((x + side * radius, y), radius, start_angle=math.pi if side > 0 else 0.0, turns=-side),
+        LinePath((x, y), (x, h + 60)),
+    ])
+    return Formation(path, members, Settings.Formations.DURATION * 1.5, _column_delays(len(members), 0.25))
+
+
+def circle_wave(members, rng):
+    w, h = Settings.Screen.WIDTH, Settings.Screen.HEIGHT
+    count = len(members)
+    # Rigid ring of ships drifting down the screen
+    center = LinePath((rng.uniform(0.3, 0.7) * w, -200), (rng.uniform(0.3, 0.7) * w, h + 200))
+    angles = np.linspace(0, 2 * math.pi, count, endpoint=False)
+    radius = 40 + 6 * count
+    offsets = np.stack([np.cos(angles), np.sin(angles)], axis=1) * radius
+    return Formation(center, members, Settings.Formations.DURATION, offsets=offsets)
+
+
+WAVES = {
+    "line": line_wave,
+    "sine": sine_wave,
+    "bezier": bezier_wave,
+    "circle": circle_wave,
+    "loop": loop_wave,
+}
+
+
+class FormationManager:
+    def __init__(self, rng=None):
+        self.formations = []
+        self.rng = rng or random
+
+    def spawn(self, members, kind=None):
+        kind = kind or self.rng.choice(sorted(WAVES))
+        formation = WAVES[kind](members, self.rng)
+        self.formations.append(formation)
+        return formation
+
+    def update(self, delta_time):
+        for formation in self.formations:
+            formation.update(delta_time)
+        self.formations = [f for f in self.formations if not f.finished]
+
+    def __len__(self):
+        return len(self.formations)
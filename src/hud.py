@@ -1,27 +1,80 @@
+import pygame
+from collections import OrderedDict
 from src.settings import Settings
 
+
+class TextCache:
+    """Bounded LRU of rendered text surfaces, keyed by (text, color)."""
+
+    def __init__(self, font, max_size=None):
+        self.font = font
+        self.max_size = max_size or Settings.HUD.TEXT_CACHE_SIZE
+        self.surfaces = OrderedDict()
+
+    def render(self, text, color):
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = self.font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
 class HUD:
     def __init__(self, font):
         self.font = font
+        self.text_cache = TextCache(font)
+
+        # Everything is composited onto one surface that is only rebuilt when a value changes
+        self.rect = pygame.Rect(0, 0, Settings.Screen.WIDTH, Settings.HUD.HEIGHT)
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.values = None
+        self.dirty = True
+        self.refresh_frames = 1  # Rebuild at most every N draws (raised by the frame pacer under load)
+        self.frames_since_rebuild = 0
 
     def draw(self, screen, player, fps):
+        self.frames_since_rebuild += 1
+        values = (player.health, player.score, fps)
+        if values != self.values and self.frames_since_rebuild >= self.refresh_frames:
+            self.values = values
+            self.dirty = True
+        if self.dirty:
+            self.rebuild(*self.values)
+
+        screen.blit(self.surface, self.rect)
+        return self.rect
+
+    def rebuild(self, health, score, fps):
+        surface = self.surface
+        surface.fill((0, 0, 0, 0))
+
         # Health Text
-        health_text = self.font.render(f"Health: {player.health}", True, Settings.Colors.BLACK)
-        screen.blit(health_text, (10, 10))
+        health_text = self.text_cache.render(f"Health: {health}", Settings.Colors.BLACK)
+        surface.blit(health_text, (10, 10))
 
         # Score Text
-        score_text = self.font.render(f"Score: {player.score}", True, Settings.Colors.BLACK)
+        score_text = self.text_cache.render(f"Score: {score}", Settings.Colors.BLACK)
         score_rect = score_text.get_rect(topright=(Settings.Screen.WIDTH - 10, 10))
-        screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
 
         # Framerate
-        fps_text = self.font.render(f"FPS: {fps}", True, Settings.Colors.BLACK)
+        fps_text = self.text_cache.render(f"FPS: {fps}", Settings.Colors.BLACK)
         fps_rect = fps_text.get_rect(topright=(Settings.Screen.WIDTH - 10, 40))
-        screen.blit(fps_text, fps_rect)
-        
+        surface.blit(fps_text, fps_rect)
+
         # Health Bar
-        # fill = (player.health / Settings.Player.MAX_HEALTH) * Settings.HUD.HEALTH_BAR_W
-        # outline_rect = pygame.Rect(10, 40, Settings.HUD.HEALTH_BAR_W, Settings.HUD.HEALTH_BAR_H)
-        # fill_rect = pygame.Rect(10, 40, fill, Settings.HUD.HEALTH_BAR_H)
-        # pygame.draw.rect(screen, Settings.Colors.RED, fill_rect)
-        # pygame.draw.rect(screen, Settings.Colors.WHITE, outline_rect, 2)
\ No newline at end of file
+        if Settings.HUD.SHOW_HEALTH_BAR:
+            fill = (health / Settings.Player.MAX_HEALTH) * Settings.HUD.HEALTH_BAR_W
+            outline_rect = pygame.Rect(10, 40, Settings.HUD.HEALTH_BAR_W, Settings.HUD.HEALTH_BAR_H)
+            fill_rect = pygame.Rect(10, 40, fill, Settings.HUD.HEALTH_BAR_H)
+            pygame.draw.rect(surface, Settings.Colors.RED, fill_rect)
+            pygame.draw.rect(surface, Settings.Colors.WHITE, outline_rect, 2)
+
+        self.dirty = False
+        self.frames_since_rebuild = 0
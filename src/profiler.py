@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+from src.settings import Settings
+
+
+class FrameProfiler:
+    """
+    Per-frame phase timer.
+
+    Call begin_frame() once per frame, mark("phase") after each phase finishes
+    (the time since the previous mark is charged to that phase) and end_frame()
+    to close the frame. The last `history` frames are kept for rolling
+    percentiles, the debug overlay and trace export.
+    """
+    enabled = True
+
+    def __init__(self, history=None):
+        self.frames = deque(maxlen=history or Settings.Profiler.HISTORY)
+        self.frame_index = 0
+        self.phases = {}
+        self._last = 0.0
+        self._frame_start = 0.0
+        self._stats = None
+        self._font = None
+
+    def begin_frame(self):
+        self._frame_start = self._last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last) * 1000.0
+        self._last = now
+
+    def end_frame(self, groups=None):
+        total = (time.perf_counter() - self._frame_start) * 1000.0
+        counts = {name: len(group) for name, group in (groups or {}).items()}
+        self.frames.append({
+            "frame": self.frame_index,
+            "total_ms": total,
+            "phases": self.phases,
+            "counts": counts,
+        })
+        self.frame_index += 1
+        if self.frame_index % Settings.Profiler.STATS_INTERVAL == 0:
+            self._stats = None  # Recompute percentiles lazily
+
+    # -------------------
+    # Stats
+    # -------------------
+    @staticmethod
+    def percentile(sorted_values, pct):
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def stats(self):
+        if self._stats is None:
+            totals = sorted(f["total_ms"] for f in self.frames)
+            self._stats = {
+                "p50": self.percentile(totals, 50),
+                "p95": self.percentile(totals, 95),
+                "p99": self.percentile(totals, 99),
+                "max": totals[-1] if totals else 0.0,
+            }
+        return self._stats
+
+    # -------------------
+    # Overlay
+    # -------------------
+    def draw_overlay(self, screen):
+        if not self.frames:
+            return None
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+
+        last = self.frames[-1]
+        stats = self.stats()
+        lines = [
+            f"frame {last['total_ms']:.2f} ms  p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f}",
+        ]
+        lines += [f"{name:<11} {ms:6.2f} ms" for name, ms in last["phases"].items()]
+        lines += [f"{name:<11} {count:6d}" for name, count in last["counts"].items()]
+
+        y = Settings.Screen.HEIGHT - 16 * len(lines) - 8
+        bounds = None
+        for line in lines:
+            text = self._font.render(line, True, Settings.Colors.BLACK)
+            rect = screen.blit(text, (10, y))
+            bounds = rect if bounds is None else bounds.union(rect)
+            y += 16
+        return bounds
+
+    # -------------------
+    # Export
+    # -------------------
+    def export(self, path):
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"stats": self.stats(), "frames": list(self.frames)}, f)
+
+    def export_csv(self, path):
+        phase_names = []
+        count_names = []
+        for frame in self.frames:
+            phase_names += [p for p in frame["phases"] if p not in phase_names]
+            count_names += [c for c in frame["counts"] if c not in count_names]
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + phase_names + [f"n_{c}" for c in count_names])
+            for frame in self.frames:
+                writer.writerow(
+                    [frame["frame"], f"{frame['total_ms']:.4f}"]
+                    + [f"{frame['phases'].get(p, 0.0):.4f}" for p in phase_names]
+                    + [frame["counts"].get(c, 0) for c in count_names]
+                )
+
+
+class NullProfiler:
+    """Drop-in no-op used when profiling is off, so hooks cost one empty call each."""
+    enabled = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self, groups=None):
+        pass
+
+    def draw_overlay(self, screen):
+        return None
+
+    def export(self, path):
+        pass
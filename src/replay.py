@@ -0,0 +1,196 @@
+"""
+Deterministic input recording and fast-forward playback.
+
+A session is fully determined by its RNG seed plus, for every PlayingState
+update, the keys held and the dt used. The recorder stores exactly that as a
+run-length encoded binary stream; playback re-simulates it headless as fast as
+the CPU allows, optionally drawing every Nth frame.
+
+    python -m src.replay info last_session.replay
+    python -m src.replay play last_session.replay --render-every 0
+    python -m src.replay play last_session.replay --render-every 2 --window
+"""
+import argparse
+import struct
+import time
+
+import pygame
+
+
+MAGIC = b"PLRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBqI")  # magic, version, seed, run count
+DT = struct.Struct("<d")          # dt is stored bit-exact so replays can't drift
+
+# Keys that affect the simulation, in bit order
+RECORDED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+
+
+def keys_to_bits(keys):
+    bits = 0
+    for i, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            bits |= 1 << i
+    return bits
+
+
+def bits_to_keys(bits):
+    return [key for i, key in enumerate(RECORDED_KEYS) if bits & (1 << i)]
+
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class ReplayRecorder:
+    """Collects (key bits, dt) per simulated frame as runs of identical frames."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.runs = []  # [bits, dt, count]
+        self.frames = 0
+        self.final_score = 0
+        self.final_health = 0
+
+    def record(self, keys, delta_time):
+        bits = keys_to_bits(keys)
+        runs = self.runs
+        if runs and runs[-1][0] == bits and runs[-1][1] == delta_time:
+            runs[-1][2] += 1
+        else:
+            runs.append([bits, delta_time, 1])
+        self.frames += 1
+
+    def finish(self, game):
+        # Stored so playback can check it arrived at the same outcome
+        self.final_score = game.player.score
+        self.final_health = game.player.health
+
+    def encode(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, len(self.runs)))
+        for bits, dt, count in self.runs:
+            write_varint(out, count)
+            out.append(bits)
+            out += DT.pack(dt)
+        write_varint(out, self.final_score)
+        write_varint(out, self.final_health)
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.encode())
+
+
+class Replay:
+    def __init__(self, seed, runs, final_score, final_health):
+        self.seed = seed
+        self.runs = runs  # [(bits, dt, count), ...]
+        self.final_score = final_score
+        self.final_health = final_health
+
+    @property
+    def frame_count(self):
+        return sum(count for _, _, count in self.runs)
+
+    def frames(self):
+        """Yield (bits, dt) per frame."""
+        for bits, dt, count in self.runs:
+            for _ in range(count):
+                yield bits, dt
+
+    @classmethod
+    def decode(cls, data):
+        magic, version, seed, run_count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+
+        pos = HEADER.size
+        runs = []
+        for _ in range(run_count):
+            count, pos = read_varint(data, pos)
+            bits = data[pos]
+            (dt,) = DT.unpack_from(data, pos + 1)
+            pos += 1 + DT.size
+            runs.append((bits, dt, count))
+        final_score, pos = read_varint(data, pos)
+        final_health, pos = read_varint(data, pos)
+        return cls(seed, runs, final_score, final_health)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
+
+
+def play(replay, render_every=0, window=False):
+    """Re-simulate a replay as fast as possible; returns a summary dict."""
+    # Imported here: src.game imports this module, and src.headless imports src.game
+    from src.headless import HeadlessRunner
+
+    frames = list(replay.frames())
+    runner = HeadlessRunner(
+        seed=replay.seed,
+        script=lambda frame: bits_to_keys(frames[frame][0]) if frame < len(frames) else (),
+        render_every=render_every,
+        stop_on_game_over=False,
+        headless=not window,
+    )
+
+    start = time.perf_counter()
+    for _, dt in frames:
+        if not runner.game.running:
+            break
+        runner.tick(dt)
+    summary = runner.summary(time.perf_counter() - start)
+    runner.close()
+    summary["recorded_frames"] = len(frames)
+    summary["matches_recording"] = (
+        summary["score"] == replay.final_score and summary["health"] == replay.final_health
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Show replay header")
+    info.add_argument("path")
+    play_cmd = sub.add_parser("play", help="Re-simulate a replay")
+    play_cmd.add_argument("path")
+    play_cmd.add_argument("--render-every", type=int, default=0, help="Draw every Nth frame (0 = never)")
+    play_cmd.add_argument("--window", action="store_true", help="Show rendered frames in a window")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    if args.command == "info":
+        print(f"seed: {replay.seed}  frames: {replay.frame_count}  runs: {len(replay.runs)}  "
+              f"final score: {replay.final_score}  final health: {replay.final_health}")
+        return
+
+    result = play(replay, args.render_every, args.window)
+    for key, value in result.items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import pygame
+from collections import OrderedDict
+
+
+class RotationCache:
+    """
+    Memoizes rotated copies of a surface (and their masks) at quantized angles.
+
+    Angles are snapped to the nearest multiple of `resolution` degrees and clamped
+    to +/- `max_angle`, so a smoothly lerping bank angle maps onto a small, fixed
+    set of entries. Entries are built lazily and evicted least-recently-used once
+    `max_size` is exceeded.
+    """
+
+    def __init__(self, image, max_angle, resolution=1.0, max_size=64):
+        self.image = image
+        self.max_angle = max_angle
+        self.resolution = resolution
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, angle):
+        angle = max(-self.max_angle, min(self.max_angle, angle))
+        return round(angle / self.resolution) * self.resolution
+
+    def get(self, angle):
+        """Return (image, mask) for the given angle, building it on a miss."""
+        key = self.quantize(angle)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        if key == 0:
+            # No need to resample the source for the neutral pose
+            image = self.image.copy()
+        else:
+            image = pygame.transform.rotate(self.image, key)
+        entry = (image, pygame.mask.from_surface(image))
+        self.entries[key] = entry
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return entry
+
+    def prewarm(self):
+        """Build every quantized angle up front (bounded by max_size)."""
+        steps = int(self.max_angle // self.resolution)
+        for i in range(-steps, steps + 1):
+            self.get(i * self.resolution)
+
+    def set_resolution(self, resolution):
+        if resolution == self.resolution:
+            return
+        self.resolution = resolution
+        self.entries.clear()
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,85 @@
+import heapq
+import itertools
+
+
+class Timer:
+    def __init__(self, due, interval, callback, args):
+        self.due = due            # Simulation time (ms) of the next firing
+        self.interval = interval  # None for one-shot timers
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Heap-based timers running on simulation time.
+
+    Time only moves when advance() is called (once per PlayingState update), so
+    anything scheduled here freezes automatically while the game is paused or
+    over. Each advance only touches the timers that are due: O(expired log n)
+    instead of polling every timer every frame. Cancelled timers are dropped
+    lazily when they reach the top of the heap.
+    """
+
+    def __init__(self):
+        self.time = 0.0
+        self.paused = False
+        self.heap = []
+        self._seq = itertools.count()  # Tie-breaker: equal due times fire in schedule order
+
+    def schedule(self, delay, callback, *args):
+        """Fire `callback(*args)` once, `delay` ms from now."""
+        return self._push(Timer(self.time + delay, None, callback, args))
+
+    def schedule_repeating(self, interval, callback, *args, first_delay=None):
+        """Fire every `interval` ms (first after `first_delay`, default one interval)."""
+        delay = interval if first_delay is None else first_delay
+        return self._push(Timer(self.time + delay, interval, callback, args))
+
+    def _push(self, timer):
+        heapq.heappush(self.heap, (timer.due, next(self._seq), timer))
+        return timer
+
+    def cancel(self, timer):
+        timer.cancel()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def remaining(self, timer):
+        return max(0.0, timer.due - self.time)
+
+    def advance(self, delta_ms):
+        if self.paused:
+            return
+        self.time += delta_ms
+        heap = self.heap
+        every_advance = []
+        while heap and heap[0][0] <= self.time:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            if timer.interval is not None and timer.interval > 0:
+                timer.due += timer.interval
+                self._push(timer)
+            elif timer.interval is not None:
+                # A zero interval means "every frame": fire once per advance,
+                # re-queued after the loop so it can't keep itself due forever
+                timer.due = self.time
+                every_advance.append(timer)
+            timer.callback(*timer.args)
+        for timer in every_advance:
+            self._push(timer)
+
+    def clear(self):
+        self.heap.clear()
+
+    def __len__(self):
+        return len(self.heap)
@@ -3,6 +3,7 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 SPRITES_DIR = os.path.join(ASSETS_DIR, "sprites")
+MAPS_DIR = os.path.join(ASSETS_DIR, "maps")
 
 class Settings:
     IS_DEBUG_MODE = False
@@ -30,12 +31,49 @@ class Settings:
         PLAYER_IMAGE = os.path.join(SPRITES_DIR, "player.png")
         BULLET_IMAGE = os.path.join(SPRITES_DIR, "tile_0001.png")
         ENEMY_IMAGE = os.path.join(SPRITES_DIR, "ship_0022.png")
+        TILESHEET_IMAGE = os.path.join(SPRITES_DIR, "tiles.png")
+        LEVEL_MAP = os.path.join(MAPS_DIR, "level_01.tmx")
+
+    # ----------------------------------------------------
+
+    class Assets:
+        DISK_CACHE_ENABLED = True
+        CACHE_DIR = os.path.join(BASE_DIR, ".asset_cache")  # Pre-scaled raw RGBA, keyed by mtime + scale
+        ATLAS_SPRITES = ["player", "bullet", "enemy"]       # Packed into one surface at startup
+        # Per-level manifests of (image name, Settings.Paths attribute), scaled by SCALE_FACTOR.
+        # "boot" is loaded before the first frame; the current level's is decoded in the background.
+        MANIFESTS = {
+            "boot": [
+                ("player", "PLAYER_IMAGE"),
+                ("bullet", "BULLET_IMAGE"),
+                ("enemy", "ENEMY_IMAGE"),
+            ],
+            "level_01": [
+                ("tileset:tiles", "TILESHEET_IMAGE"),
+            ],
+        }
+        LEVEL = "level_01"
+        PRELOAD_THREAD = True   # Decode level assets on a worker thread (off -> load on first use)
+        PUMP_BUDGET_MS = 2.0    # Main-thread time per frame for converting preloaded images
+        TILE_SIZE = 16      # tiles.png: 16x16 tiles ...
+        TILE_SPACING = 1    # ... with 1px gaps
+
+    # ----------------------------------------------------
+
+    class World:
+        ENABLED = True                      # Scrolling tile-map background (off -> plain BG fill)
+        SCROLL_SPEED = 40                   # Screen pixels per second
+        CHUNK_SURFACES = 3                  # Pre-rendered chunk surfaces per layer (ring buffer)
+        CHUNK_ROWS = 20                     # Map rows per streamed chunk (>= one screen at 32px tiles)
+        LOOKAHEAD_CHUNKS = 1                # Chunks prefetched ahead of the camera
+        CHUNK_MEMORY_BUDGET = 4 * 1024 * 1024  # Bytes of tile data kept resident (row sources + decoded chunks)
 
     # ----------------------------------------------------
 
     class Timers:
         SHOOT_DELAY = 500
         ENEMY_SPAWN_DELAY = 1000
+        FORMATION_SPAWN_DELAY = 8000
 
     # ----------------------------------------------------
 
@@ -56,18 +94,99 @@ class Settings:
         MAX_BANK_ANGLE = 15  # Max tilt in degrees
         BANK_SPEED = 8       # How fast to tilt
 
+        # Rotation cache
+        ROTATION_CACHE_RESOLUTION = 1.0  # Degrees between cached bank angles
+        ROTATION_CACHE_SIZE = 64         # Max cached (image, mask) pairs
+        PREWARM_ROTATION_CACHE = True    # Build every angle at spawn
+
     # ----------------------------------------------------
 
     class Enemy:
         SPEED = 3
 
     # ----------------------------------------------------
+
+    class Formations:
+        ENABLED = False       # Path-following waves on top of the regular spawns (changes balance)
+        SIZE = 8              # Ships per wave
+        DURATION = 6.0        # Seconds for the leader to fly the whole path
+        TABLE_SAMPLES = 256   # Path lookup-table resolution
+
+    # ----------------------------------------------------
         
     class Bullet:
         SPEED = 10
 
     # ----------------------------------------------------
 
+    class Render:
+        TARGET_FPS = 60
+        IDLE_FPS = 10            # Frame cap for static screens (paused, game over)
+        USE_DIRTY_RECTS = False  # Only redraw/update regions under moving sprites
+        FULL_FLIP_RATIO = 0.5    # Fall back to a full flip past this fraction of the screen
+
+    # ----------------------------------------------------
+
+    class Performance:
+        FRAME_BUDGET_MS = None      # Work time allowed per frame (None -> 1000 / Render.TARGET_FPS)
+        MAX_STEPS_PER_FRAME = 5     # Fixed Headless.FIXED_DT steps run per frame at most; older backlog is dropped
+        HISTORY = 120               # Frame times kept for the load estimate
+        ADAPTIVE_QUALITY = True     # Shed optional work when frames run over budget
+        EVAL_INTERVAL = 30          # Frames between load checks
+        DEGRADE_RATIO = 0.9         # Drop a quality level when p90 work time > budget * this ...
+        RECOVER_RATIO = 0.6         # ... and restore one when it stays < budget * this ...
+        RECOVER_EVALS = 4           # ... for this many checks in a row
+        # Quality levels, 0 = full quality. Each step sheds a bit more:
+        # debug overlays, then HUD refresh rate, then particles, then player rotation steps
+        DEBUG_OVERLAY = [True, False, False, False, False]
+        HUD_REFRESH_FRAMES = [1, 1, 4, 4, 8]
+        PARTICLE_SCALE = [1.0, 1.0, 1.0, 0.5, 0.25]
+        ROTATION_CACHE_RESOLUTION = [None, None, None, None, 3.0]  # None -> Player.ROTATION_CACHE_RESOLUTION
+
+    # ----------------------------------------------------
+
+    class Profiler:
+        ENABLED = False       # Also switched on by IS_DEBUG_MODE
+        HISTORY = 600         # Frames kept for percentiles / export
+        STATS_INTERVAL = 30   # Frames between percentile refreshes
+        TRACE_PATH = None     # e.g. "frame_trace.csv" or ".json"; written on quit
+
+    # ----------------------------------------------------
+
+    class Replay:
+        RECORD = False  # Record every session; saved on quit
+        PATH = os.path.join(BASE_DIR, "last_session.replay")
+
+    # ----------------------------------------------------
+
+    class Headless:
+        FIXED_DT = 1 / 60     # Simulation step in seconds
+        MAX_STEPS_PER_ADVANCE = 240  # Spiral-of-death guard for the accumulator
+
+    # ----------------------------------------------------
+
+    class Projectiles:
+        ENGINE_ENABLED = False  # Use the NumPy ProjectileEngine instead of Bullet sprites
+        CAPACITY = 16384
+
+    # ----------------------------------------------------
+
+    class Pools:
+        BULLET_MAX = 256     # Max idle bullets kept for reuse
+        ENEMY_MAX = 128
+        BULLET_PREFILL = 32  # Built up front so the first volleys don't allocate
+        ENEMY_PREFILL = 16
+
+    # ----------------------------------------------------
+
+    class Collision:
+        CELL_SIZE = None  # None -> derived from the largest enemy rect each frame
+
+    # ----------------------------------------------------
+
     class HUD:
         HEALTH_BAR_W = 100
-        HEALTH_BAR_H = 10
\ No newline at end of file
+        HEALTH_BAR_H = 10
+        SHOW_HEALTH_BAR = False
+        HEIGHT = 70             # Height of the cached HUD strip at the top of the screen
+        TEXT_CACHE_SIZE = 64    # Max rendered label surfaces kept (LRU)
\ No newline at end of file
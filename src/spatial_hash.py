@@ -0,0 +1,91 @@
+class SpatialHash:
+    """
+    Uniform-grid broad phase for sprite collisions.
+
+    Sprites of one group are bucketed by the grid cells their rect touches.
+    Queries only look at the buckets under the query rect, so testing B bullets
+    against E enemies costs roughly O(B + E) instead of O(B x E). The narrow phase
+    is whatever pygame would have used (`collided`, or rect overlap by default), so
+    results match `pygame.sprite.groupcollide` / `spritecollide` exactly.
+    """
+
+    def __init__(self, cell_size=None):
+        # None -> derive the cell size from the largest inserted sprite each rebuild
+        self.fixed_cell_size = cell_size
+        self.cell_size = cell_size or 64
+        self.cells = {}
+
+    def rebuild(self, sprites):
+        self.cells.clear()
+        sprites = list(sprites)
+        if not sprites:
+            return
+
+        if self.fixed_cell_size is None:
+            extent = max(max(s.rect.width, s.rect.height) for s in sprites)
+            self.cell_size = max(extent, 1)
+
+        cells = self.cells
+        for sprite in sprites:
+            for key in self._keys(sprite.rect):
+                bucket = cells.get(key)
+                if bucket is None:
+                    cells[key] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def _keys(self, rect):
+        cs = self.cell_size
+        x0 = rect.left // cs
+        y0 = rect.top // cs
+        x1 = max(rect.left, rect.right - 1) // cs
+        y1 = max(rect.top, rect.bottom - 1) // cs
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield (cx, cy)
+
+    def query(self, rect):
+        """Return the unique sprites sharing at least one cell with rect."""
+        cells = self.cells
+        if not cells:
+            return []
+        found = {}
+        for key in self._keys(rect):
+            bucket = cells.get(key)
+            if bucket:
+                for sprite in bucket:
+                    found[sprite] = None
+        return list(found)
+
+    # -------------------
+    # pygame-compatible collision helpers
+    # -------------------
+    def spritecollide(self, sprite, group, dokill, collided=None):
+        """Same contract as pygame.sprite.spritecollide; `group` must be the hashed group."""
+        hits = []
+        members = group.spritedict
+        rect = sprite.rect
+        for other in self.query(rect):
+            # Sprites killed earlier this frame are still bucketed; skip them
+            if other not in members:
+                continue
+            if collided is None:
+                if not rect.colliderect(other.rect):
+                    continue
+            elif not collided(sprite, other):
+                continue
+            if dokill:
+                other.kill()
+            hits.append(other)
+        return hits
+
+    def groupcollide(self, groupa, groupb, dokilla, dokillb, collided=None):
+        """Same contract as pygame.sprite.groupcollide; `groupb` must be the hashed group."""
+        crashed = {}
+        for sprite in groupa.sprites():
+            hits = self.spritecollide(sprite, groupb, dokillb, collided)
+            if hits:
+                crashed[sprite] = hits
+                if dokilla:
+                    sprite.kill()
+        return crashed
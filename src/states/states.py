@@ -3,6 +3,9 @@ from ..settings import Settings
 
 
 class BaseState:
+    # Frame cap while this state is active (None -> Settings.Render.TARGET_FPS)
+    target_fps = None
+
     def __init__(self, game):
         self.game = game # Store a reference to the main game object
 
@@ -17,8 +20,17 @@ class BaseState:
         """Update game logic for this state."""
         return "SELF"
 
+    def enter(self):
+        """Called when the game switches to this state."""
+        pass
+
     def draw(self, screen):
-        """Draw all graphics for this state."""
+        """
+        Draw all graphics for this state.
+
+        Return None to have the whole display flipped, or a list of rects to
+        update only those regions (an empty list means nothing changed).
+        """
         pass # Most states will override this
     
     def get_next_state(self):
@@ -28,6 +40,14 @@ class BaseState:
 class PlayingState(BaseState):
     def __init__(self, game):
         super().__init__(game)
+        # Dirty-rect bookkeeping (only used with Settings.Render.USE_DIRTY_RECTS)
+        self.full_redraw = True
+        self.prev_extra_rects = []
+
+    def enter(self):
+        # Whatever was on screen (pause overlay etc.) has to go
+        self.full_redraw = True
+        self.game.scheduler.resume()
 
     def handle_events(self, events):
         # First, check for generic events (like quit)
@@ -42,19 +62,33 @@ class PlayingState(BaseState):
                     return "PAUSED" # Signal to transition to PAUSED
         
         # Pass keys to player update
-        self.game.keys = pygame.key.get_pressed()
+        self.game.keys = self.game.input_source()
         return "SELF" # Stay in PLAYING state
 
     def update(self, delta_time):
+        # Everything the simulation depends on this frame: held keys + dt
+        if self.game.recorder is not None:
+            self.game.recorder.record(self.game.keys, delta_time)
+        if self.game.scrolling is not None:
+            self.game.scrolling.update(delta_time)
+        profiler = self.game.profiler
         self.game.player.update(self.game.keys, delta_time)
         if self.game.keys[pygame.K_SPACE]:
             self.game.handle_shooting()
+        profiler.mark("player")
 
-        self.game.spawn_enemy()
+        # Fires due spawn/reload timers; frozen whenever this update isn't running
+        self.game.scheduler.advance(delta_time * 1000.0)
+        profiler.mark("spawn")
         self.game.handle_collisions()
+        profiler.mark("collisions")
 
+        self.game.formations.update(delta_time)
         self.game.enemies.update()
         self.game.bullets.update()
+        if self.game.projectiles is not None:
+            self.game.projectiles.update()
+        profiler.mark("entities")
 
         # Check for state transition
         if self.game.player.health <= 0:
@@ -64,14 +98,112 @@ class PlayingState(BaseState):
         return "SELF"
 
     def draw(self, screen):
+        # A scrolling background changes every pixel, so dirty rects don't apply
+        if Settings.Render.USE_DIRTY_RECTS and not self.full_redraw and self.game.scrolling is None:
+            return self.draw_dirty(screen)
+        self.render_full(screen)
+        return None
+
+    def render_full(self, screen):
         # All of your main drawing logic from Game.draw()
-        screen.fill(Settings.Colors.BG)
+        if self.game.scrolling is not None:
+            self.game.scrolling.draw(screen)
+        else:
+            screen.blit(self.game.background, (0, 0))
         self.game.all_sprites.draw(screen)
+        self.prev_extra_rects = self.draw_extras(screen)
+        self.full_redraw = False
+
+    def draw_extras(self, screen):
+        """Draw everything that isn't in all_sprites; returns the rects covered."""
+        rects = []
+        if self.game.projectiles is not None:
+            bounds = self.game.projectiles.draw(screen)
+            if bounds:
+                rects.append(bounds)
         current_fps = int(self.game.clock.get_fps())
-        self.game.hud.draw(screen, self.game.player, current_fps)
+        rects.append(self.game.hud.draw(screen, self.game.player, current_fps))
+        if Settings.IS_DEBUG_MODE and self.game.pacer.show_debug_overlay:
+            self.game.debug_renderer.draw(screen, self.game.all_sprites)
+            overlay = self.game.profiler.draw_overlay(screen)
+            if overlay:
+                rects.append(overlay)
+        return rects
+
+    def draw_dirty(self, screen):
+        background = self.game.background
 
+        # Erase last frame: sprites (incl. killed ones) and the non-sprite extras
+        self.game.all_sprites.clear(screen, background)
+        for rect in self.prev_extra_rects:
+            screen.blit(background, rect, rect)
+
+        dirty = self.game.all_sprites.draw(screen)
+        extra = self.draw_extras(screen)
+        dirty = dirty + extra + self.prev_extra_rects
+        self.prev_extra_rects = extra
+
+        # Past a point, one big flip is cheaper than many small updates
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > Settings.Render.FULL_FLIP_RATIO * Settings.Screen.WIDTH * Settings.Screen.HEIGHT:
+            return None
+        return dirty
+
+
+class SnapshotState(BaseState):
+    """
+    Base for static overlay screens drawn on top of a frozen game frame.
+
+    The playing frame plus overlay is composited once when the state is entered
+    and kept as a snapshot. After that nothing is redrawn unless the window asks
+    for a repaint, and the frame cap drops to Settings.Render.IDLE_FPS.
+    """
+    REPAINT_EVENTS = (
+        pygame.VIDEOEXPOSE,
+        pygame.WINDOWEXPOSED,
+        pygame.WINDOWRESTORED,
+        pygame.WINDOWSIZECHANGED,
+        pygame.WINDOWSHOWN,
+    )
 
-class PausedState(BaseState):
+    def __init__(self, game):
+        super().__init__(game)
+        self.target_fps = Settings.Render.IDLE_FPS
+        self.snapshot = None
+        self.needs_repaint = True
+
+    def enter(self):
+        self.snapshot = None
+        self.needs_repaint = True
+        self.game.scheduler.pause()
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type in self.REPAINT_EVENTS:
+                self.needs_repaint = True
+        return super().handle_events(events)
+
+    def draw(self, screen):
+        if self.snapshot is None:
+            # Draw the playing screen *first*, then our overlay, and keep the result
+            self.game.states["PLAYING"].render_full(screen)
+            self.draw_overlay(screen)
+            self.snapshot = screen.copy()
+            self.needs_repaint = False
+            return None
+
+        if self.needs_repaint:
+            screen.blit(self.snapshot, (0, 0))
+            self.needs_repaint = False
+            return None
+
+        return []  # Nothing changed; skip the flip entirely
+
+    def draw_overlay(self, screen):
+        pass
+
+
+class PausedState(SnapshotState):
     def __init__(self, game):
         super().__init__(game)
         # Pre-render text surfaces
@@ -103,18 +235,15 @@ class PausedState(BaseState):
         # Nothing happens when paused!
         pass
 
-    def draw(self, screen):
-        # IMPORTANT: Draw the playing screen *first*
-        self.game.states["PLAYING"].draw(screen)
-        
-        # Then draw the pause overlay and text on top
+    def draw_overlay(self, screen):
+        # Draw the pause overlay and text on top of the frozen frame
         screen.blit(self.overlay, (0, 0))
         screen.blit(self.pause_text, self.p_rect)
         screen.blit(self.resume_text, self.r_rect)
         screen.blit(self.quit_text, self.q_rect)
 
 
-class GameOverState(BaseState):
+class GameOverState(SnapshotState):
     def __init__(self, game):
         super().__init__(game)
         # Pre-render text surfaces
@@ -151,11 +280,8 @@ class GameOverState(BaseState):
         # Nothing happens on game over screen
         pass
 
-    def draw(self, screen):
-        # Draw the final playing screen *first*
-        self.game.states["PLAYING"].draw(screen)
-        
-        # Then draw the game over overlay and text
+    def draw_overlay(self, screen):
+        # Draw the game over overlay and text on top of the final frame
         screen.blit(self.overlay, (0, 0))
         screen.blit(self.game_over_text, self.go_rect)
         screen.blit(self.score_text, self.score_rect)
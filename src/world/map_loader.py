@@ -0,0 +1,556 @@
+"""
+Tiled map loading with vertical chunk streaming.
+
+Maps saved by Tiled (TMX or JSON) are read into lightweight headers up front.
+TMX files are scanned with a streaming (expat) parser: CSV layers keep only
+the byte offset of each row and re-read the rows they need from disk, base64
+layers keep their encoded text. Tile data is only decoded a chunk of rows at a
+time. ChunkStreamer keeps the chunks around the camera resident, loads the
+ones just ahead of it and evicts the ones left behind; whatever the row
+sources keep resident counts against the same memory budget.
+
+JSON has no incremental parser in the standard library, so JSON maps are read
+whole; their tile arrays show up in the budget like any other source.
+"""
+import base64
+import gzip
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+import xml.parsers.expat as expat
+import zlib
+from collections import OrderedDict, deque
+
+import numpy as np
+from src.settings import Settings
+
+
+# Tiled stores flip/rotation flags in the top bits of each gid
+GID_MASK = 0x1FFFFFFF
+
+
+# -------------------
+# Row sources (lazy decoders for one layer's tile data)
+# -------------------
+class ArrayRows:
+    """Tile data that is already a flat list/array (JSON maps without encoding)."""
+
+    def __init__(self, data, width, height):
+        self.grid = np.asarray(data, dtype=np.uint32).reshape(height, width)
+
+    @property
+    def nbytes(self):
+        return self.grid.nbytes
+
+    def rows(self, start, end):
+        return self.grid[start:end].copy()
+
+
+class Base64Rows:
+    """
+    Uncompressed base64 data: each row is `width * 4` bytes, so any row range
+    maps onto a slice of the base64 text that can be decoded on its own.
+    """
+
+    def __init__(self, text, width, height):
+        self.text = "".join(text.split())
+        self.width = width
+        self.height = height
+
+    @property
+    def nbytes(self):
+        return len(self.text)
+
+    def rows(self, start, end):
+        row_bytes = self.width * 4
+        byte_start, byte_end = start * row_bytes, end * row_bytes
+        char_start = (byte_start // 3) * 4
+        char_end = -(-byte_end // 3) * 4
+        raw = base64.b64decode(self.text[char_start:char_end])
+        skip = byte_start - (char_start // 4) * 3
+        data = np.frombuffer(raw, dtype="<u4", count=(end - start) * self.width, offset=skip)
+        return data.astype(np.uint32).reshape(end - start, self.width)
+
+
+class CompressedRows:
+    """
+    zlib/gzip data can't be seeked into; it's inflated once on first access and
+    the whole layer stays resident from then on (counted in `nbytes`).
+    """
+
+    def __init__(self, text, compression, width, height):
+        self.text = text
+        self.compression = compression
+        self.width = width
+        self.height = height
+        self.grid = None
+
+    @property
+    def nbytes(self):
+        return self.grid.nbytes if self.grid is not None else len(self.text)
+
+    def rows(self, start, end):
+        if self.grid is None:
+            raw = base64.b64decode("".join(self.text.split()))
+            if self.compression == "zlib":
+                raw = zlib.decompress(raw)
+            elif self.compression == "gzip":
+                raw = gzip.decompress(raw)
+            else:
+                raise ValueError(f"Unsupported tile layer compression: {self.compression}")
+            self.grid = np.frombuffer(raw, dtype="<u4").astype(np.uint32).reshape(self.height, self.width)
+            self.text = None
+        return self.grid[start:end].copy()
+
+
+class CsvRows:
+    """In-memory CSV data; Tiled writes one map row per line, so rows are parsed on demand."""
+
+    def __init__(self, text, width, height):
+        self.lines = [line for line in text.strip().splitlines() if line.strip()]
+        self.width = width
+        self.grid = None
+        if len(self.lines) != height:
+            # Not one row per line (hand-edited?) -> fall back to parsing everything
+            self.grid = _parse_csv(text).reshape(height, width)
+            self.lines = None
+
+    @property
+    def nbytes(self):
+        if self.grid is not None:
+            return self.grid.nbytes
+        return sum(len(line) for line in self.lines)
+
+    def rows(self, start, end):
+        if self.grid is not None:
+            return self.grid[start:end].copy()
+        return _parse_csv("\n".join(self.lines[start:end])).reshape(end - start, self.width)
+
+
+class CsvFileRows:
+    """
+    TMX CSV data left in the file: only each row's byte range is kept, and a
+    chunk's rows are read back from disk when it's loaded.
+    """
+
+    def __init__(self, path, data_start, data_end, width, height):
+        self.path = path
+        self.width = width
+        self.grid = None
+
+        with open(path, "rb") as f:
+            # data_start points at "<data ...>"; the CSV begins after its ">"
+            f.seek(data_start)
+            head = f.read(data_end - data_start if data_end - data_start < 4096 else 4096)
+            content_start = data_start + head.index(b">") + 1
+            starts, ends = self._index_lines(f, content_start, data_end)
+
+            if len(starts) != height:
+                # Not one row per line -> parse the whole layer once
+                f.seek(content_start)
+                self.grid = _parse_csv(f.read(data_end - content_start).decode("ascii")).reshape(height, width)
+                starts = ends = ()
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+
+    @staticmethod
+    def _index_lines(f, start, end, block_size=65536):
+        """Byte ranges of the non-blank lines in [start, end), read a block at a time."""
+        starts, ends = [], []
+        f.seek(start)
+        pos = line_start = start
+        has_data = False
+        while pos < end:
+            block = f.read(min(block_size, end - pos))
+            if not block:
+                break
+            i = 0
+            while True:
+                newline = block.find(b"\n", i)
+                segment = block[i:] if newline < 0 else block[i:newline]
+                has_data = has_data or bool(segment.strip())
+                if newline < 0:
+                    break
+                if has_data:
+                    starts.append(line_start)
+                    ends.append(pos + newline)
+                line_start = pos + newline + 1
+                has_data = False
+                i = newline + 1
+            pos += len(block)
+        if has_data:
+            starts.append(line_start)
+            ends.append(end)
+        return starts, ends
+
+    @property
+    def nbytes(self):
+        if self.grid is not None:
+            return self.grid.nbytes
+        return self.starts.nbytes + self.ends.nbytes
+
+    def rows(self, start, end):
+        if self.grid is not None:
+            return self.grid[start:end].copy()
+        byte_start, byte_end = int(self.starts[start]), int(self.ends[end - 1])
+        with open(self.path, "rb") as f:
+            f.seek(byte_start)
+            text = f.read(byte_end - byte_start).decode("ascii")
+        return _parse_csv(text).reshape(end - start, self.width)
+
+
+def _parse_csv(text):
+    values = [v for v in text.replace("\n", ",").split(",") if v.strip()]
+    return np.fromiter(map(int, values), dtype=np.uint32, count=len(values))
+
+
+def make_row_source(data, encoding, compression, width, height):
+    if encoding is None:
+        return ArrayRows(data, width, height)
+    if encoding == "csv":
+        return CsvRows(data, width, height)
+    if encoding == "base64":
+        if compression:
+            return CompressedRows(data, compression, width, height)
+        return Base64Rows(data, width, height)
+    raise ValueError(f"Unsupported tile layer encoding: {encoding}")
+
+
+# -------------------
+# Map model
+# -------------------
+class TileLayer:
+    def __init__(self, name, width, height, source, parallax=(1.0, 1.0), visible=True):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.source = source
+        self.parallax = parallax
+        self.visible = visible
+
+    def rows(self, start, end):
+        start = max(0, start)
+        end = min(self.height, end)
+        return self.source.rows(start, end)
+
+
+class Tileset:
+    def __init__(self, firstgid, name, image, tilewidth, tileheight, spacing=0, margin=0, columns=0, tilecount=0):
+        self.firstgid = firstgid
+        self.name = name
+        self.image = image
+        self.tilewidth = tilewidth
+        self.tileheight = tileheight
+        self.spacing = spacing
+        self.margin = margin
+        self.columns = columns
+        self.tilecount = tilecount
+
+
+class TiledMap:
+    def __init__(self, path, width, height, tilewidth, tileheight, layers, tilesets):
+        self.path = path
+        self.width = width              # In tiles
+        self.height = height
+        self.tilewidth = tilewidth      # In source pixels
+        self.tileheight = tileheight
+        self.layers = layers
+        self.tilesets = tilesets
+
+    @property
+    def pixel_height(self):
+        return self.height * self.tileheight
+
+    def get_layer(self, name):
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+
+# -------------------
+# Parsers
+# -------------------
+def load_map(path):
+    if path.endswith((".json", ".tmj")):
+        return load_json_map(path)
+    return load_tmx_map(path)
+
+
+def _resolve(base_path, relative):
+    return os.path.normpath(os.path.join(os.path.dirname(base_path), relative))
+
+
+def load_json_map(path):
+    with open(path) as f:
+        doc = json.load(f)
+
+    layers = []
+    for layer in doc.get("layers", []):
+        if layer.get("type") != "tilelayer" or "data" not in layer:
+            continue  # Object/image layers and infinite maps aren't streamed
+        width, height = layer["width"], layer["height"]
+        source = make_row_source(layer["data"], layer.get("encoding"), layer.get("compression"), width, height)
+        parallax = (layer.get("parallaxx", 1.0), layer.get("parallaxy", 1.0))
+        layers.append(TileLayer(layer["name"], width, height, source, parallax, layer.get("visible", True)))
+
+    tilesets = []
+    for ts in doc.get("tilesets", []):
+        if "source" in ts:
+            tilesets.append(_load_external_tileset(_resolve(path, ts["source"]), ts["firstgid"]))
+        else:
+            tilesets.append(_json_tileset(ts, ts["firstgid"], path))
+
+    return TiledMap(path, doc["width"], doc["height"], doc["tilewidth"], doc["tileheight"], layers, tilesets)
+
+
+class _TmxIndexer:
+    """
+    Expat handlers that record a TMX map's structure in one streaming pass.
+
+    CSV tile data is skipped over (only the byte offsets of its <data>
+    element are kept); base64 text and legacy <tile> gids are collected
+    since they can't be read back by row.
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.map_attrs = {}
+        self.layers = []
+        self.tilesets = []   # [attrs, image attrs or None]
+        self.tileset = None
+        self.layer = None
+        self.in_data = False
+        self.text = None
+
+    def start(self, name, attrs):
+        if name == "map":
+            self.map_attrs = attrs
+        elif name == "tileset":
+            self.tileset = [attrs, None]
+            self.tilesets.append(self.tileset)
+        elif name == "image" and self.tileset is not None:
+            self.tileset[1] = attrs
+        elif name == "layer":
+            self.layer = {"attrs": attrs, "data": None, "tiles": [], "infinite": False}
+        elif name == "data" and self.layer is not None:
+            self.layer["data"] = dict(attrs, start=self.parser.CurrentByteIndex)
+            self.in_data = True
+            if attrs.get("encoding") == "base64":
+                self.text = []
+        elif name == "chunk" and self.in_data:
+            self.layer["infinite"] = True
+        elif name == "tile" and self.in_data:
+            self.layer["tiles"].append(int(attrs.get("gid", 0)))
+
+    def end(self, name):
+        if name == "tileset":
+            self.tileset = None
+        elif name == "data" and self.in_data:
+            self.layer["data"]["end"] = self.parser.CurrentByteIndex
+            if self.text is not None:
+                self.layer["data"]["text"] = "".join(self.text)
+                self.text = None
+            self.in_data = False
+        elif name == "layer" and self.layer is not None:
+            self.layers.append(self.layer)
+            self.layer = None
+
+    def characters(self, data):
+        if self.text is not None:
+            self.text.append(data)
+
+
+def load_tmx_map(path):
+    parser = expat.ParserCreate()
+    index = _TmxIndexer(parser)
+    parser.StartElementHandler = index.start
+    parser.EndElementHandler = index.end
+    parser.CharacterDataHandler = index.characters
+    with open(path, "rb") as f:
+        parser.ParseFile(f)
+
+    layers = []
+    for info in index.layers:
+        attrs, data = info["attrs"], info["data"]
+        if data is None or info["infinite"]:
+            continue  # Infinite maps aren't supported
+        width, height = int(attrs["width"]), int(attrs["height"])
+        encoding = data.get("encoding")
+        if encoding is None:
+            # Legacy <tile gid=".."/> children
+            source = ArrayRows(info["tiles"], width, height)
+        elif encoding == "csv":
+            source = CsvFileRows(path, data["start"], data["end"], width, height)
+        else:
+            source = make_row_source(data.get("text", ""), encoding, data.get("compression"), width, height)
+        parallax = (float(attrs.get("parallaxx", 1.0)), float(attrs.get("parallaxy", 1.0)))
+        visible = attrs.get("visible", "1") != "0"
+        layers.append(TileLayer(attrs.get("name"), width, height, source, parallax, visible))
+
+    tilesets = []
+    for attrs, image in index.tilesets:
+        firstgid = int(attrs["firstgid"])
+        if attrs.get("source"):
+            tilesets.append(_load_external_tileset(_resolve(path, attrs["source"]), firstgid))
+        else:
+            tilesets.append(_tileset_from_attrs(attrs, image, firstgid, path))
+
+    root = index.map_attrs
+    return TiledMap(
+        path, int(root["width"]), int(root["height"]),
+        int(root["tilewidth"]), int(root["tileheight"]), layers, tilesets
+    )
+
+
+def _load_external_tileset(path, firstgid):
+    if path.endswith((".json", ".tsj")):
+        with open(path) as f:
+            return _json_tileset(json.load(f), firstgid, path)
+    return _tmx_tileset(ET.parse(path).getroot(), firstgid, path)
+
+
+def _json_tileset(ts, firstgid, base_path):
+    image = _resolve(base_path, ts["image"]) if "image" in ts else None
+    return Tileset(
+        firstgid, ts.get("name", ""), image, ts["tilewidth"], ts["tileheight"],
+        ts.get("spacing", 0), ts.get("margin", 0), ts.get("columns", 0), ts.get("tilecount", 0)
+    )
+
+
+def _tmx_tileset(ts, firstgid, base_path):
+    image = ts.find("image")
+    return _tileset_from_attrs(ts.attrib, image.attrib if image is not None else None, firstgid, base_path)
+
+
+def _tileset_from_attrs(attrs, image, firstgid, base_path):
+    return Tileset(
+        firstgid, attrs.get("name", ""),
+        _resolve(base_path, image["source"]) if image is not None else None,
+        int(attrs["tilewidth"]), int(attrs["tileheight"]),
+        int(attrs.get("spacing", 0)), int(attrs.get("margin", 0)),
+        int(attrs.get("columns", 0)), int(attrs.get("tilecount", 0))
+    )
+
+
+# -------------------
+# Chunk streaming
+# -------------------
+class Chunk:
+    def __init__(self, index, row_start, row_end, layers):
+        self.index = index
+        self.row_start = row_start
+        self.row_end = row_end
+        self.layers = layers  # layer name -> (rows, width) uint32 gid array
+
+    @property
+    def nbytes(self):
+        return sum(grid.nbytes for grid in self.layers.values())
+
+
+class ChunkStreamer:
+    """
+    Keeps horizontal bands of `chunk_rows` map rows resident around the camera.
+
+    The level scrolls upwards (the camera starts at the bottom of the map), so
+    "ahead" means lower row indices. Each update() makes the visible chunks
+    resident, prefetches up to `lookahead` chunks ahead, and evicts chunks that
+    scrolled out behind the camera or that push memory past `budget_bytes`.
+
+    The budget covers what the layers' row sources keep resident (row
+    offsets, encoded text, inflated grids) plus the decoded chunks; only the
+    chunks can be evicted, so a map whose sources alone exceed the budget
+    just keeps the visible chunks.
+    """
+
+    def __init__(self, tiled_map, chunk_rows=None, lookahead=None, budget_bytes=None):
+        self.map = tiled_map
+        self.chunk_rows = chunk_rows or Settings.World.CHUNK_ROWS
+        self.lookahead = Settings.World.LOOKAHEAD_CHUNKS if lookahead is None else lookahead
+        self.budget_bytes = budget_bytes or Settings.World.CHUNK_MEMORY_BUDGET
+        self.chunk_count = -(-tiled_map.height // self.chunk_rows)
+
+        self.chunks = OrderedDict()
+        self.resident_bytes = 0
+
+        # Metrics
+        self.loads = 0
+        self.evictions = 0
+        self.load_times = deque(maxlen=120)
+
+    def chunk_range_for(self, top_px, view_height_px, tile_height):
+        first = int(top_px // (self.chunk_rows * tile_height))
+        last = int((top_px + view_height_px - 1) // (self.chunk_rows * tile_height))
+        return max(0, first), min(self.chunk_count - 1, last)
+
+    @property
+    def source_bytes(self):
+        return sum(layer.source.nbytes for layer in self.map.layers)
+
+    @property
+    def total_bytes(self):
+        return self.source_bytes + self.resident_bytes
+
+    def update(self, top_px, view_height_px, tile_height=None):
+        """`top_px` is the map y (in map pixels) at the top of the screen."""
+        tile_height = tile_height or self.map.tileheight
+        first, last = self.chunk_range_for(top_px, view_height_px, tile_height)
+
+        for index in range(first, last + 1):
+            self.get_chunk(index)
+
+        # Prefetch at most one chunk per frame so a long lookahead can't stall a frame
+        for index in range(first - 1, first - 1 - self.lookahead, -1):
+            if index >= 0 and index not in self.chunks:
+                self.get_chunk(index)
+                break
+
+        # Anything below the camera is behind us for good
+        for index in [i for i in self.chunks if i > last]:
+            self._evict(index)
+
+        # Still over budget: drop whatever is furthest ahead first
+        budget = self.budget_bytes - self.source_bytes
+        for index in sorted(self.chunks):
+            if self.resident_bytes <= budget:
+                break
+            if index < first:
+                self._evict(index)
+
+    def get_chunk(self, index):
+        chunk = self.chunks.get(index)
+        if chunk is not None:
+            self.chunks.move_to_end(index)
+            return chunk
+
+        start = time.perf_counter()
+        row_start = index * self.chunk_rows
+        row_end = min(row_start + self.chunk_rows, self.map.height)
+        layers = {layer.name: layer.rows(row_start, row_end) for layer in self.map.layers}
+        chunk = Chunk(index, row_start, row_end, layers)
+        self.load_times.append((time.perf_counter() - start) * 1000.0)
+
+        self.chunks[index] = chunk
+        self.resident_bytes += chunk.nbytes
+        self.loads += 1
+        return chunk
+
+    def _evict(self, index):
+        chunk = self.chunks.pop(index)
+        self.resident_bytes -= chunk.nbytes
+        self.evictions += 1
+
+    def metrics(self):
+        times = self.load_times
+        return {
+            "resident_chunks": len(self.chunks),
+            "resident_bytes": self.resident_bytes,
+            "source_bytes": self.source_bytes,
+            "budget_bytes": self.budget_bytes,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "load_ms_last": times[-1] if times else 0.0,
+            "load_ms_avg": sum(times) / len(times) if times else 0.0,
+            "load_ms_max": max(times) if times else 0.0,
+        }
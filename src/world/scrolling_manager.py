@@ -0,0 +1,154 @@
+import math
+
+import pygame
+from src.settings import Settings
+from src.world.map_loader import ChunkStreamer, GID_MASK
+
+
+class ChunkRing:
+    """
+    A small, fixed set of pre-rendered chunk surfaces reused round-robin.
+
+    Each slot holds one chunk of one layer rendered at screen scale; when a new
+    chunk is needed the least recently used slot is redrawn in place, so no
+    surfaces are allocated while scrolling.
+    """
+
+    def __init__(self, size, chunk_size, transparent):
+        self.transparent = transparent
+        self.slots = []
+        for _ in range(size):
+            if transparent:
+                surface = pygame.Surface(chunk_size, pygame.SRCALPHA).convert_alpha()
+            else:
+                surface = pygame.Surface(chunk_size).convert()
+            self.slots.append(surface)
+        self.owner = [None] * size   # chunk index held by each slot
+        self.lookup = {}             # chunk index -> slot
+        self.clock = 0
+        self.last_used = [0] * size
+        self.renders = 0
+
+    def get(self, index, render):
+        self.clock += 1
+        slot = self.lookup.get(index)
+        if slot is None:
+            slot = self.last_used.index(min(self.last_used))
+            if self.owner[slot] is not None:
+                del self.lookup[self.owner[slot]]
+            self.owner[slot] = index
+            self.lookup[index] = slot
+            render(index, self.slots[slot])
+            self.renders += 1
+        self.last_used[slot] = self.clock
+        return self.slots[slot]
+
+
+class ScrollingLayer:
+    def __init__(self, scrolling, layer, ring_size, transparent):
+        self.scrolling = scrolling
+        self.layer = layer
+        self.parallax = layer.parallax[1]
+        self.ring = ChunkRing(ring_size, scrolling.chunk_size, transparent)
+
+    def render_chunk(self, index, surface):
+        scrolling = self.scrolling
+        if self.ring.transparent:
+            surface.fill((0, 0, 0, 0))
+        else:
+            surface.fill(Settings.Colors.BG)
+
+        grid = scrolling.streamer.get_chunk(index).layers[self.layer.name]
+        tile = scrolling.tile_px
+        tiles = scrolling.tiles
+        blits = []
+        for row, gids in enumerate(grid.tolist()):
+            y = row * tile
+            for col, gid in enumerate(gids):
+                image = tiles.get(gid & GID_MASK)
+                if image is not None:
+                    blits.append((image, (col * tile, y)))
+        surface.fblits(blits)
+
+    def draw(self, screen, scroll):
+        """Blit the visible slice of the (looping) layer: normally two blits."""
+        scrolling = self.scrolling
+        map_h = scrolling.map_px_height
+        screen_h = Settings.Screen.HEIGHT
+        # Float offsets accumulate; only the blit position is snapped to whole pixels
+        top = math.floor(map_h - screen_h - scroll * self.parallax) % map_h
+
+        screen_y = 0
+        while screen_y < screen_h:
+            index = top // scrolling.chunk_px_height
+            chunk_top = index * scrolling.chunk_px_height
+            chunk_h = scrolling.chunk_height(index)
+            src_y = top - chunk_top
+            h = min(chunk_h - src_y, screen_h - screen_y)
+
+            surface = self.ring.get(index, self.render_chunk)
+            screen.blit(surface, (0, screen_y), pygame.Rect(0, src_y, scrolling.chunk_size[0], h))
+
+            screen_y += h
+            top = (top + h) % map_h
+
+
+class ScrollingManager:
+    """
+    Scrolling tile-map background.
+
+    Tile layers are pre-rendered chunk by chunk into screen-width surfaces held
+    in a small ring buffer, so each frame costs a couple of blits per layer no
+    matter how many tiles the map has. Layers scroll at their Tiled `parallaxy`
+    factor and the level loops when it reaches the top of the map.
+    """
+
+    def __init__(self, tiled_map, asset_manager, speed=None, scale_factor=None):
+        self.map = tiled_map
+        self.speed = Settings.World.SCROLL_SPEED if speed is None else speed
+        scale_factor = scale_factor or Settings.SCALE_FACTOR
+
+        self.tile_px = int(tiled_map.tileheight * scale_factor)
+        self.streamer = ChunkStreamer(tiled_map)
+        self.chunk_px_height = self.streamer.chunk_rows * self.tile_px
+        self.chunk_size = (tiled_map.width * self.tile_px, self.chunk_px_height)
+        self.map_px_height = tiled_map.height * self.tile_px
+        self.tiles = self.load_tiles(asset_manager, scale_factor)
+
+        # Enough slots for the two visible chunks plus the one being scrolled in
+        ring_size = Settings.World.CHUNK_SURFACES
+        visible = [layer for layer in tiled_map.layers if layer.visible]
+        self.layers = [
+            ScrollingLayer(self, layer, ring_size, transparent=(i > 0))
+            for i, layer in enumerate(visible)
+        ]
+        self.scroll = 0.0  # Sub-pixel accurate distance scrolled, in screen pixels
+
+    def load_tiles(self, asset_manager, scale_factor):
+        """Map gid -> scaled tile surface via AssetManager sprite-sheet slicing."""
+        tiles = {}
+        for tileset in self.map.tilesets:
+            if tileset.image is None:
+                continue
+            name = f"tileset:{tileset.name or tileset.firstgid}"
+            regions = asset_manager.load_sprite_sheet(
+                name, tileset.image, tileset.tilewidth, scale_factor,
+                spacing=tileset.spacing, margin=tileset.margin
+            )
+            for i in range(len(regions)):
+                tiles[tileset.firstgid + i] = asset_manager.get_image(f"{name}:{i}")
+        return tiles
+
+    def chunk_height(self, index):
+        rows = min(self.streamer.chunk_rows, self.map.height - index * self.streamer.chunk_rows)
+        return rows * self.tile_px
+
+    def update(self, delta_time):
+        self.scroll += self.speed * delta_time
+        # Keep the streamer's resident window around the base layer's camera
+        top = math.floor(self.map_px_height - Settings.Screen.HEIGHT - self.scroll) % self.map_px_height
+        self.streamer.update(top, Settings.Screen.HEIGHT, self.tile_px)
+
+    def draw(self, screen):
+        for layer in self.layers:
+            layer.draw(screen, self.scroll)
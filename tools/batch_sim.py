@@ -0,0 +1,205 @@
+"""
+Multi-process batch simulation for balance tuning.
+
+Runs many headless games across a process pool, each with its own seed and
+Settings overrides, driven by a scripted or random-policy player. Collects
+survival time, score and simulation speed per run and aggregates them per
+configuration.
+
+    python -m tools.batch_sim --set Enemy.SPEED=2,3,4 --set Timers.ENEMY_SPAWN_DELAY=500,1000 \\
+        --seeds 20 --policy random --csv results.csv
+"""
+import argparse
+import ast
+import contextlib
+import csv
+import io
+import itertools
+import multiprocessing
+import os
+import random
+import statistics
+import time
+
+import pygame
+
+from src.settings import Settings
+
+
+# -------------------
+# Settings overrides
+# -------------------
+def resolve_setting(path):
+    """'Enemy.SPEED' -> (Settings.Enemy, 'SPEED')."""
+    *parents, attr = path.split(".")
+    owner = Settings
+    for name in parents:
+        owner = getattr(owner, name)
+    if not hasattr(owner, attr):
+        raise AttributeError(f"Unknown setting: {path}")
+    return owner, attr
+
+
+@contextlib.contextmanager
+def overridden(overrides):
+    saved = []
+    try:
+        for path, value in overrides.items():
+            owner, attr = resolve_setting(path)
+            saved.append((owner, attr, getattr(owner, attr)))
+            setattr(owner, attr, value)
+        yield
+    finally:
+        for owner, attr, value in reversed(saved):
+            setattr(owner, attr, value)
+
+
+def parse_set(spec):
+    """'Enemy.SPEED=2,3,4' -> ('Enemy.SPEED', [2, 3, 4])."""
+    path, _, values = spec.partition("=")
+    resolve_setting(path)  # Fail fast on typos
+    return path, [ast.literal_eval(v) for v in values.split(",")]
+
+
+# -------------------
+# Policies
+# -------------------
+POLICY_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+
+def make_policy(name, seed):
+    if name == "random":
+        # Own RNG so the policy never disturbs the game's seeded `random` stream
+        rng = random.Random(seed * 7919 + 1)
+        held = []
+
+        def policy(frame):
+            if frame % 15 == 0:
+                held[:] = [k for k in POLICY_KEYS if rng.random() < 0.35] + [pygame.K_SPACE]
+            return held
+        return policy
+
+    from src.headless import SCRIPTS
+    return SCRIPTS[name]
+
+
+# -------------------
+# Worker
+# -------------------
+def init_worker():
+    # pygame.init() would otherwise install SDL's SIGTERM handler, and the
+    # workers would then ignore Pool.terminate()
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+
+
+def run_job(job):
+    from src.headless import HeadlessRunner
+
+    config, seed, policy, max_frames = job
+    with overridden(dict(config)), contextlib.redirect_stdout(io.StringIO()):
+        runner = HeadlessRunner(seed=seed, script=make_policy(policy, seed))
+        result = runner.run(max_frames)
+        runner.close()
+    pygame.quit()
+
+    return {
+        "config": config,
+        "seed": seed,
+        "survival_s": result["sim_seconds"],
+        "survived": result["state"] != "GAME_OVER",
+        "score": result["score"],
+        "frames": result["frames"],
+        "sim_fps": result["frames_per_second"],
+    }
+
+
+# -------------------
+# Aggregation
+# -------------------
+def format_config(config):
+    return " ".join(f"{path}={value}" for path, value in config) or "(defaults)"
+
+
+def aggregate(results):
+    rows = []
+    key = lambda r: r["config"]
+    for config, group in itertools.groupby(sorted(results, key=key), key=key):
+        group = list(group)
+        survival = [r["survival_s"] for r in group]
+        scores = [r["score"] for r in group]
+        rows.append({
+            "config": format_config(config),
+            "runs": len(group),
+            "survival_mean": statistics.fmean(survival),
+            "survival_std": statistics.pstdev(survival),
+            "survival_min": min(survival),
+            "survived_pct": 100.0 * sum(r["survived"] for r in group) / len(group),
+            "score_mean": statistics.fmean(scores),
+            "score_std": statistics.pstdev(scores),
+            "sim_fps_mean": statistics.fmean(r["sim_fps"] for r in group),
+        })
+    return rows
+
+
+def print_table(rows):
+    width = max([len(r["config"]) for r in rows] + [6])
+    print(f"{'config':<{width}} {'runs':>5} {'surv s':>8} {'± std':>7} {'min':>7} {'alive%':>7} {'score':>7} {'± std':>6} {'sim fps':>9}")
+    for r in rows:
+        print(
+            f"{r['config']:<{width}} {r['runs']:>5} {r['survival_mean']:>8.1f} {r['survival_std']:>7.1f} "
+            f"{r['survival_min']:>7.1f} {r['survived_pct']:>7.1f} {r['score_mean']:>7.1f} {r['score_std']:>6.1f} "
+            f"{r['sim_fps_mean']:>9.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--set", action="append", default=[], metavar="PATH=V1,V2",
+                        help="Settings override to sweep, e.g. Enemy.SPEED=2,3,4 (repeatable)")
+    parser.add_argument("--seeds", type=int, default=10, help="Seeds per configuration")
+    parser.add_argument("--seed-base", type=int, default=0)
+    parser.add_argument("--policy", default="random", help="random, or a src.headless script name")
+    parser.add_argument("--max-frames", type=int, default=60 * 60 * 5, help="Per-run cap (default 5 sim minutes)")
+    parser.add_argument("--processes", type=int, default=None, help="Default: all cores")
+    parser.add_argument("--csv", help="Write per-run results here")
+    args = parser.parse_args()
+
+    sweeps = [parse_set(spec) for spec in args.set]
+    configs = [
+        tuple(zip([path for path, _ in sweeps], values))
+        for values in itertools.product(*[values for _, values in sweeps])
+    ]
+    jobs = [
+        (config, args.seed_base + i, args.policy, args.max_frames)
+        for config in configs
+        for i in range(args.seeds)
+    ]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.processes, initializer=init_worker) as pool:
+        results = []
+        for done, result in enumerate(pool.imap_unordered(run_job, jobs, chunksize=4), 1):
+            results.append(result)
+            print(f"\r{done}/{len(jobs)} runs", end="", flush=True)
+        pool.close()
+        pool.join()
+    print(f"\r{len(jobs)} runs in {time.perf_counter() - start:.1f}s\n")
+
+    print_table(aggregate(results))
+
+    if args.csv:
+        paths = [path for path, _ in sweeps]
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(paths + ["seed", "survival_s", "survived", "score", "frames", "sim_fps"])
+            for r in sorted(results, key=lambda r: (r["config"], r["seed"])):
+                values = dict(r["config"])
+                writer.writerow(
+                    [values[p] for p in paths]
+                    + [r["seed"], f"{r['survival_s']:.3f}", int(r["survived"]), r["score"], r["frames"], f"{r['sim_fps']:.0f}"]
+                )
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Stress mode for the collision broad phase.
+
+Fills the playfield with thousands of bullets and enemies and times
+pygame's brute-force groupcollide against the SpatialHash path, checking
+that both produce identical scores and damage.
+
+    python -m tools.stress_collisions --counts 250 1000 4000 --frames 20
+"""
+import argparse
+import random
+import time
+
+import pygame
+
+from src.settings import Settings
+from src.spatial_hash import SpatialHash
+
+
+class Box(pygame.sprite.Sprite):
+    def __init__(self, x, y, w, h):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, w, h)
+        self.rect.center = (x, y)
+
+
+def make_world(rng, count):
+    w, h = Settings.Screen.WIDTH, Settings.Screen.HEIGHT
+    size = 16 * Settings.SCALE_FACTOR
+    bullets = pygame.sprite.Group(
+        Box(rng.randrange(w), rng.randrange(h), 8, 8) for _ in range(count)
+    )
+    enemies = pygame.sprite.Group(
+        Box(rng.randrange(w), rng.randrange(h), size, size) for _ in range(count)
+    )
+    player = Box(w // 2, h - 50, size, size)
+    return player, bullets, enemies
+
+
+def resolve(player, bullets, enemies, grid):
+    """Mirror of Game.handle_collisions; returns (score, damage)."""
+    if grid is None:
+        bullet_enemy = pygame.sprite.groupcollide(bullets, enemies, True, True)
+        player_hit = pygame.sprite.spritecollide(player, enemies, True)
+    else:
+        grid.rebuild(enemies)
+        bullet_enemy = grid.groupcollide(bullets, enemies, True, True)
+        player_hit = grid.spritecollide(player, enemies, True)
+    score = sum(len(v) for v in bullet_enemy.values())
+    damage = len(player_hit) * Settings.Player.COLLISION_DAMAGE
+    return score, damage
+
+
+def run(count, frames, seed):
+    timings = {"groupcollide": 0.0, "spatial_hash": 0.0}
+    for frame in range(frames):
+        for name, grid in (("groupcollide", None), ("spatial_hash", SpatialHash(Settings.Collision.CELL_SIZE))):
+            # Same seed per frame so both paths see the identical world
+            world = make_world(random.Random(seed + frame), count)
+            start = time.perf_counter()
+            result = resolve(*world, grid)
+            timings[name] += time.perf_counter() - start
+            if name == "groupcollide":
+                expected = result
+            elif result != expected:
+                raise AssertionError(f"Mismatch at {count} entities: {result} != {expected}")
+    return {name: total / frames * 1000.0 for name, total in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 1000, 2000, 4000])
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'entities':>10} {'groupcollide ms':>16} {'spatial hash ms':>16} {'speedup':>8}")
+    for count in args.counts:
+        ms = run(count, args.frames, args.seed)
+        speedup = ms["groupcollide"] / ms["spatial_hash"] if ms["spatial_hash"] else float("inf")
+        print(f"{count * 2:>10} {ms['groupcollide']:>16.2f} {ms['spatial_hash']:>16.2f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()